@@ -4,20 +4,89 @@ FastAPI endpoints for the CroweLM Biotech AI Platform
 """
 
 import os
-from typing import Optional, List
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional, List
+
+import aiohttp
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
+from crowelm.agents import BiotechAgent, BiotechConfig
+from crowelm.nims import NVIDIANIMs
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients once per worker so HTTP connections are reused across requests"""
+    # One connection pool for every upstream the API talks to
+    app.state.shared_connector = aiohttp.TCPConnector(
+        limit=200,
+        limit_per_host=32,
+        keepalive_timeout=75,
+        ttl_dns_cache=600,
+        enable_cleanup_closed=True,
+    )
+
+    app.state.agent = BiotechAgent(
+        BiotechConfig(verbose=False), connector=app.state.shared_connector
+    )
+    await app.state.agent._ensure_session()
+
+    try:
+        app.state.nims = NVIDIANIMs(connector=app.state.shared_connector)
+        await app.state.nims._ensure_session()
+    except ValueError:
+        # NVIDIA_API_KEY not set; /molecules/generate reports this per request
+        app.state.nims = None
+
+    yield
+
+    await app.state.agent.close()
+    if app.state.nims:
+        await app.state.nims.close()
+    await app.state.shared_connector.close()
+
+
 app = FastAPI(
     title="CroweLM API",
     description="Biotech AI Platform for Drug Discovery",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
+# Dependencies are async so FastAPI resolves them inline instead of
+# dispatching to the threadpool on every request
+async def get_agent(request: Request) -> BiotechAgent:
+    """Shared BiotechAgent created at startup"""
+    return request.app.state.agent
+
+
+async def get_nims(request: Request) -> NVIDIANIMs:
+    """Shared NVIDIANIMs client created at startup"""
+    nims = request.app.state.nims
+    if nims is None:
+        raise HTTPException(status_code=400, detail="NVIDIA_API_KEY environment variable not set")
+    return nims
+
+
+# Handlers return ORJSONResponse directly to skip building the response models;
+# the models below are kept as response_model for the OpenAPI schema only.
 class ChatRequest(BaseModel):
     message: str
     model: str = "crowelogic/crowelogic:v1.0"
+    stream: bool = False
 
 
 class ChatResponse(BaseModel):
@@ -68,52 +137,59 @@ async def root():
     }
 
 
+async def _sse_events(tokens: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Frame streamed tokens as server-sent events"""
+    async for token in tokens:
+        yield b"data: " + orjson.dumps({"delta": token}) + b"\n\n"
+    yield b"data: [DONE]\n\n"
+
+
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    """Chat with the biotech agent"""
-    try:
-        from crowelm.agents import BiotechAgent, BiotechConfig
+async def chat(
+    request: ChatRequest,
+    agent: BiotechAgent = Depends(get_agent),
+):
+    """Chat with the biotech agent (set ``stream`` for server-sent events)"""
+    if request.stream:
+        return StreamingResponse(
+            _sse_events(agent._llm_stream(request.message, model=request.model)),
+            media_type="text/event-stream",
+        )
 
-        config = BiotechConfig(model_name=request.model)
-        async with BiotechAgent(config) as agent:
-            response = await agent._llm_query(request.message)
-            return ChatResponse(response=response, model=request.model)
+    try:
+        response = await agent._llm_query(request.message, model=request.model)
+        return ORJSONResponse({"response": response, "model": request.model})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/target/{target_id}", response_model=TargetResponse)
-async def analyze_target(target_id: str):
+async def analyze_target(target_id: str, agent: BiotechAgent = Depends(get_agent)):
     """Analyze a drug target by UniProt ID"""
     try:
-        from crowelm.agents import BiotechAgent
-
-        async with BiotechAgent() as agent:
-            # Fetch UniProt data
-            uniprot_data = await agent.fetch_uniprot(target_id)
-
-            return TargetResponse(
-                target_id=target_id,
-                gene=uniprot_data.get("gene"),
-                protein_name=uniprot_data.get("protein_name"),
-                druggability_score=0.75,  # Placeholder
-            )
+        # Fetch UniProt data
+        uniprot_data = await agent.fetch_uniprot(target_id)
+
+        return ORJSONResponse({
+            "target_id": target_id,
+            "gene": uniprot_data.get("gene"),
+            "protein_name": uniprot_data.get("protein_name"),
+            "druggability_score": 0.75,  # Placeholder
+            "analysis": None,
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/molecules/generate", response_model=MoleculeResponse)
-async def generate_molecules(request: MoleculeRequest):
+async def generate_molecules(request: MoleculeRequest, nims: NVIDIANIMs = Depends(get_nims)):
     """Generate novel molecules using NVIDIA MolMIM"""
     try:
-        from crowelm.nims import NVIDIANIMs
-
-        async with NVIDIANIMs() as nims:
-            result = await nims.generate_molecules(
-                num_molecules=request.num_molecules,
-                smi=request.seed_smiles,
-            )
-            return MoleculeResponse(molecules=result.get("molecules", []))
+        result = await nims.generate_molecules(
+            num_molecules=request.num_molecules,
+            smi=request.seed_smiles,
+        )
+        return ORJSONResponse({"molecules": result.get("molecules", [])})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -122,4 +198,17 @@ async def generate_molecules(request: MoleculeRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # Workers are separate processes; each builds its own shared clients in lifespan().
+    # app_dir makes "api.main" importable when run as `python api/main.py`;
+    # "auto" picks uvloop/httptools when installed and falls back otherwise
+    uvicorn.run(
+        "api.main:app",
+        app_dir=str(Path(__file__).resolve().parent.parent),
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        workers=int(os.environ.get("CROWELM_API_WORKERS", 2 * (os.cpu_count() or 1))),
+        log_level="warning",
+    )
@@ -18,12 +18,26 @@ Usage:
 
 import asyncio
 import aiohttp
-import json
-import argparse
-from typing import Dict, List, Optional, Any
+import logging
+import orjson
+import os
+import time
+import warnings
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple, Any
 from dataclasses import dataclass
 from datetime import datetime
 
+from crowelm.core import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Separate connect/read bounds so a dead host fails fast instead of burning the full 60 s
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=5, sock_read=55)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+# Ask UniProt/ChEMBL/PubMed for compressed bodies on every pooled request
+_SESSION_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+
 
 @dataclass
 class BiotechConfig:
@@ -32,6 +46,57 @@ class BiotechConfig:
     model_name: str = "crowelogic/crowelogic:v1.0"
     temperature: float = 0.2
     max_tokens: int = 4096
+    ncbi_api_key: str = ""
+    cache_ttl: float = 86400  # UniProt/ChEMBL records change on the order of months
+    cache_size: int = 4096
+    verbose: bool = True  # Log analysis progress (disabled by the API server)
+    cache_path: Optional[str] = None  # SQLite HTTP cache shared across processes
+
+    def __post_init__(self):
+        # An NCBI key lifts the E-utilities rate limit from 3 to 10 requests/s
+        if not self.ncbi_api_key:
+            self.ncbi_api_key = os.environ.get("NCBI_API_KEY", "")
+        if self.cache_path is None:
+            self.cache_path = os.environ.get("CROWELM_HTTP_CACHE") or None
+
+
+class _CacheEntry(NamedTuple):
+    expires_at: float
+    etag: Optional[str]
+    value: Dict
+
+
+class _TTLCache:
+    """In-process LRU cache with per-entry expiry and ETag revalidation"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[_CacheEntry]:
+        """Return the entry for key (possibly expired), marking it recently used"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, value: Dict, etag: Optional[str] = None):
+        self._entries[key] = _CacheEntry(time.monotonic() + self.ttl, etag, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def is_fresh(entry: Optional[_CacheEntry]) -> bool:
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    @staticmethod
+    def revalidation_headers(entry: Optional[_CacheEntry]) -> Optional[Dict[str, str]]:
+        """Conditional-request headers for refreshing a stale entry"""
+        if entry is not None and entry.etag:
+            return {"If-None-Match": entry.etag}
+        return None
 
 
 class BiotechAgent:
@@ -99,21 +164,94 @@ Use structured, quantitative outputs:
 
 Created by Michael Crowe | CroweLM"""
 
+    # Built once and shared by every request that uses the default prompt
+    _SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+
     # Database API endpoints
     UNIPROT_API = "https://rest.uniprot.org/uniprotkb"
     CHEMBL_API = "https://www.ebi.ac.uk/chembl/api/data"
     PUBMED_API = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, config: Optional[BiotechConfig] = None):
+    # Only the UniProt fields fetch_uniprot reads; the full entry is many times larger
+    UNIPROT_FIELDS = (
+        "accession,gene_primary,protein_name,organism_name,"
+        "cc_function,cc_subcellular_location,length,sequence"
+    )
+
+    # Above this many PMIDs, esummary is POSTed so long id lists stay out of the URL
+    PUBMED_POST_THRESHOLD = 20
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._SYSTEM_MSG = {"role": "system", "content": cls.SYSTEM_PROMPT}
+
+    def __init__(
+        self,
+        config: Optional[BiotechConfig] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+    ):
         self.config = config or BiotechConfig()
+        # An injected connector is shared with other clients and never closed here
+        self._connector = connector
         self._session: Optional[aiohttp.ClientSession] = None
+        self._uniprot_cache = _TTLCache(self.config.cache_size, self.config.cache_ttl)
+        self._chembl_cache = _TTLCache(self.config.cache_size, self.config.cache_ttl)
+        self._ncbi_lock = asyncio.Lock()
+        self._ncbi_sent: deque = deque(maxlen=10)
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=60)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            if self._connector is not None:
+                self._session = self._create_session(self._connector, connector_owner=False)
+                return self._session
+
+            # Keep-alive + DNS cache so repeated UniProt/ChEMBL/PubMed/LLM calls
+            # reuse connections instead of paying a fresh TCP/TLS handshake;
+            # the per-host cap stops one upstream from starving the others
+            connector = aiohttp.TCPConnector(
+                limit=200,
+                limit_per_host=32,
+                keepalive_timeout=75,
+                ttl_dns_cache=600,
+                enable_cleanup_closed=True,
+            )
+            self._session = self._create_session(connector)
         return self._session
 
+    def _create_session(
+        self, connector: aiohttp.BaseConnector, connector_owner: bool = True
+    ) -> aiohttp.ClientSession:
+        """Build the HTTP session, backed by a persistent response cache if configured"""
+        if self.config.cache_path:
+            try:
+                from aiohttp_client_cache import CachedSession, SQLiteBackend
+            except ImportError:
+                warnings.warn(
+                    "aiohttp-client-cache not installed; HTTP cache disabled. "
+                    "Install with: pip install crowelm-agents[cache]",
+                    ImportWarning,
+                )
+            else:
+                # Only GETs (UniProt/ChEMBL/PubMed) are cached; LLM POSTs pass through
+                backend = SQLiteBackend(
+                    cache_name=self.config.cache_path,
+                    expire_after=self.config.cache_ttl,
+                )
+                return CachedSession(
+                    cache=backend,
+                    timeout=_DEFAULT_TIMEOUT,
+                    connector=connector,
+                    connector_owner=connector_owner,
+                    headers=_SESSION_HEADERS,
+                )
+
+        return aiohttp.ClientSession(
+            timeout=_DEFAULT_TIMEOUT,
+            connector=connector,
+            connector_owner=connector_owner,
+            headers=_SESSION_HEADERS,
+        )
+
     async def close(self):
         if self._session and not self._session.closed:
             await self._session.close()
@@ -125,141 +263,213 @@ Created by Michael Crowe | CroweLM"""
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
 
-    async def _llm_query(self, prompt: str, system: str = None) -> str:
-        """Query the LLM via Docker Model Runner"""
-        session = await self._ensure_session()
-
-        payload = {
-            "model": self.config.model_name,
+    def _llm_payload(self, prompt: str, system: str = None, model: str = None) -> Dict:
+        """Build a chat/completions request body"""
+        return {
+            "model": model or self.config.model_name,
             "messages": [
-                {"role": "system", "content": system or self.SYSTEM_PROMPT},
+                {"role": "system", "content": system} if system else self._SYSTEM_MSG,
                 {"role": "user", "content": prompt}
             ],
             "temperature": self.config.temperature,
             "max_tokens": self.config.max_tokens,
         }
 
+    async def _llm_query(self, prompt: str, system: str = None, model: str = None) -> str:
+        """Query the LLM via Docker Model Runner"""
+        session = await self._ensure_session()
+        payload = self._llm_payload(prompt, system, model)
+
         try:
             async with session.post(
                 f"{self.config.model_url}/chat/completions",
-                json=payload,
-                headers={"Content-Type": "application/json"}
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS
             ) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = orjson.loads(await resp.read())
                     return data["choices"][0]["message"]["content"]
                 else:
                     return f"Error: {resp.status}"
         except Exception as e:
             return f"Error: {str(e)}"
 
-    async def fetch_uniprot(self, accession: str) -> Dict:
-        """Fetch protein data from UniProt"""
+    async def _llm_stream(
+        self, prompt: str, system: str = None, model: str = None
+    ) -> AsyncIterator[str]:
+        """Stream LLM completion tokens via Docker Model Runner (server-sent events)"""
+        session = await self._ensure_session()
+        payload = self._llm_payload(prompt, system, model)
+        payload["stream"] = True
+
+        try:
+            async with session.post(
+                f"{self.config.model_url}/chat/completions",
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS
+            ) as resp:
+                if resp.status != 200:
+                    yield f"Error: {resp.status}"
+                    return
+
+                async for line in resp.content:
+                    line = line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    choices = orjson.loads(data).get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+        except Exception as e:
+            yield f"Error: {str(e)}"
+
+    async def fetch_uniprot(self, accession: str, include_sequence: bool = False) -> Dict:
+        """Fetch protein data from UniProt (with the canonical sequence if requested)"""
+        def view(value: Dict) -> Dict:
+            result = dict(value)
+            if not include_sequence:
+                result.pop("sequence", None)
+            return result
+
+        cached = self._uniprot_cache.get(accession)
+        if self._uniprot_cache.is_fresh(cached):
+            return view(cached.value)
+
         session = await self._ensure_session()
         try:
             async with session.get(
-                f"{self.UNIPROT_API}/{accession}.json"
+                f"{self.UNIPROT_API}/{accession}.json",
+                params={"fields": self.UNIPROT_FIELDS},
+                headers=self._uniprot_cache.revalidation_headers(cached)
             ) as resp:
+                if resp.status == 304 and cached:
+                    self._uniprot_cache.set(accession, cached.value, cached.etag)
+                    return view(cached.value)
                 if resp.status == 200:
-                    data = await resp.json()
-                    return {
+                    data = orjson.loads(await resp.read())
+                    function, locations = self._extract_comments(data)
+                    sequence = data.get("sequence", {})
+                    result = {
                         "accession": data.get("primaryAccession"),
                         "gene": data.get("genes", [{}])[0].get("geneName", {}).get("value"),
                         "protein_name": data.get("proteinDescription", {}).get("recommendedName", {}).get("fullName", {}).get("value"),
-                        "function": self._extract_function(data),
-                        "subcellular_location": self._extract_location(data),
-                        "sequence_length": data.get("sequence", {}).get("length"),
+                        "function": function,
+                        "subcellular_location": locations,
+                        "sequence_length": sequence.get("length"),
                         "organism": data.get("organism", {}).get("scientificName"),
+                        "sequence": sequence.get("value"),
                     }
+                    self._uniprot_cache.set(accession, result, resp.headers.get("ETag"))
+                    return view(result)
                 return {"error": f"UniProt error: {resp.status}"}
         except Exception as e:
             return {"error": str(e)}
 
-    def _extract_function(self, data: Dict) -> str:
-        """Extract function from UniProt data"""
-        comments = data.get("comments", [])
-        for c in comments:
-            if c.get("commentType") == "FUNCTION":
-                texts = c.get("texts", [])
-                if texts:
-                    return texts[0].get("value", "")
-        return ""
-
-    def _extract_location(self, data: Dict) -> List[str]:
-        """Extract subcellular locations"""
+    def _extract_comments(self, data: Dict) -> Tuple[str, List[str]]:
+        """Extract function and subcellular locations from UniProt comments in one pass"""
+        function = ""
         locations = []
-        comments = data.get("comments", [])
-        for c in comments:
-            if c.get("commentType") == "SUBCELLULAR LOCATION":
+        for c in data.get("comments", []):
+            comment_type = c.get("commentType")
+            if comment_type == "FUNCTION":
+                if not function:
+                    texts = c.get("texts", [])
+                    if texts:
+                        function = texts[0].get("value", "")
+            elif comment_type == "SUBCELLULAR LOCATION":
                 for loc in c.get("subcellularLocations", []):
                     loc_data = loc.get("location", {})
                     if loc_data.get("value"):
                         locations.append(loc_data["value"])
-        return locations
+        return function, locations
 
     async def fetch_chembl_target(self, uniprot_id: str) -> Dict:
         """Fetch ChEMBL target data"""
+        cached = self._chembl_cache.get(uniprot_id)
+        if self._chembl_cache.is_fresh(cached):
+            return dict(cached.value)
+
         session = await self._ensure_session()
         try:
             async with session.get(
                 f"{self.CHEMBL_API}/target.json",
-                params={"target_components__accession": uniprot_id}
+                params={"target_components__accession": uniprot_id},
+                headers=self._chembl_cache.revalidation_headers(cached)
             ) as resp:
+                if resp.status == 304 and cached:
+                    self._chembl_cache.set(uniprot_id, cached.value, cached.etag)
+                    return dict(cached.value)
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = orjson.loads(await resp.read())
                     targets = data.get("targets", [])
+                    result = {"found": False}
                     if targets:
                         t = targets[0]
-                        return {
+                        result = {
                             "chembl_id": t.get("target_chembl_id"),
                             "pref_name": t.get("pref_name"),
                             "target_type": t.get("target_type"),
                             "organism": t.get("organism"),
                         }
+                    self._chembl_cache.set(uniprot_id, result, resp.headers.get("ETag"))
+                    return dict(result)
                 return {"found": False}
         except Exception as e:
             return {"error": str(e)}
 
     async def search_pubmed(self, query: str, max_results: int = 5) -> List[Dict]:
         """Search PubMed for relevant publications"""
+        return (await self.search_pubmed_batch([query], max_results))[query]
+
+    async def search_pubmed_batch(
+        self, queries: List[str], max_results: int = 5
+    ) -> Dict[str, List[Dict]]:
+        """
+        Search PubMed for several queries, fetching all summaries in one request.
+
+        Each query still needs its own esearch (that is what attributes PMIDs to
+        a query), but the esummary lookups are merged, so N queries cost N + 1
+        requests instead of 2N.
+        """
         session = await self._ensure_session()
+        base_params = {"db": "pubmed", "retmode": "json"}
+        if self.config.ncbi_api_key:
+            base_params["api_key"] = self.config.ncbi_api_key
+
+        results = {query: [] for query in queries}
         try:
             # Search
-            async with session.get(
-                f"{self.PUBMED_API}/esearch.fcgi",
-                params={
-                    "db": "pubmed",
-                    "term": query,
-                    "retmax": max_results,
-                    "retmode": "json"
-                }
-            ) as resp:
-                if resp.status != 200:
-                    return []
-                data = await resp.json()
-                ids = data.get("esearchresult", {}).get("idlist", [])
-
-            if not ids:
-                return []
+            id_lists = await asyncio.gather(*(
+                self._pubmed_esearch(session, base_params, query, max_results)
+                for query in results
+            ))
+            all_ids = list(dict.fromkeys(pid for ids in id_lists for pid in ids))
+            if not all_ids:
+                return results
 
             # Fetch summaries
-            async with session.get(
-                f"{self.PUBMED_API}/esummary.fcgi",
-                params={
-                    "db": "pubmed",
-                    "id": ",".join(ids),
-                    "retmode": "json"
-                }
-            ) as resp:
+            summary_url = f"{self.PUBMED_API}/esummary.fcgi"
+            summary_params = {**base_params, "id": ",".join(all_ids)}
+            await self._ncbi_throttle()
+            if len(all_ids) > self.PUBMED_POST_THRESHOLD:
+                summary_request = session.post(summary_url, data=summary_params)
+            else:
+                summary_request = session.get(summary_url, params=summary_params)
+
+            async with summary_request as resp:
                 if resp.status != 200:
-                    return []
-                data = await resp.json()
-                result = data.get("result", {})
+                    return results
+                data = orjson.loads(await resp.read())
+                summaries = data.get("result", {})
 
-                papers = []
+            for query, ids in zip(results, id_lists):
+                papers = results[query]
                 for pid in ids:
-                    if pid in result:
-                        p = result[pid]
+                    if pid in summaries:
+                        p = summaries[pid]
                         papers.append({
                             "pmid": pid,
                             "title": p.get("title"),
@@ -267,16 +477,45 @@ Created by Michael Crowe | CroweLM"""
                             "journal": p.get("source"),
                             "pubdate": p.get("pubdate"),
                         })
-                return papers
+            return results
 
         except Exception as e:
-            return []
+            return results
+
+    async def _pubmed_esearch(
+        self, session: aiohttp.ClientSession, base_params: Dict, query: str, max_results: int
+    ) -> List[str]:
+        await self._ncbi_throttle()
+        async with session.get(
+            f"{self.PUBMED_API}/esearch.fcgi",
+            params={**base_params, "term": query, "retmax": max_results}
+        ) as resp:
+            if resp.status != 200:
+                return []
+            data = orjson.loads(await resp.read())
+            return data.get("esearchresult", {}).get("idlist", [])
+
+    async def _ncbi_throttle(self):
+        """Hold E-utilities requests to NCBI's limit (3/s, or 10/s with an API key)"""
+        rate = 10 if self.config.ncbi_api_key else 3
+        async with self._ncbi_lock:
+            # Sliding one-second window: bursts up to the limit go straight out
+            sent = self._ncbi_sent
+            if len(sent) >= rate:
+                wait = sent[-rate] + 1.0 - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            sent.append(time.monotonic())
+
+    def _log(self, msg: str, *args):
+        """Log analysis progress when verbose output is enabled"""
+        if self.config.verbose:
+            logger.info(msg, *args)
 
     async def analyze_target(self, target_id: str) -> Dict:
         """Comprehensive drug target analysis"""
-        print(f"\n{'=' * 60}")
-        print(f"  BIOTECH ANALYSIS: {target_id}")
-        print(f"{'=' * 60}\n")
+        rule = "=" * 60
+        self._log("\n%s\n  BIOTECH ANALYSIS: %s\n%s\n", rule, target_id, rule)
 
         results = {
             "target": target_id,
@@ -285,42 +524,47 @@ Created by Michael Crowe | CroweLM"""
             "analysis": "",
         }
 
-        # Fetch UniProt data
-        print(">>> Fetching UniProt data...")
-        uniprot_data = await self.fetch_uniprot(target_id)
+        async def fetch_uniprot_and_literature():
+            # PubMed needs the gene symbol, so it chains off UniProt while
+            # ChEMBL runs alongside both
+            uniprot = await self.fetch_uniprot(target_id)
+            gene = uniprot.get("gene") or target_id
+            return uniprot, gene, await self.search_pubmed(f"{gene} drug target", max_results=3)
+
+        self._log(">>> Fetching UniProt, ChEMBL and PubMed data...")
+        (uniprot_data, gene_name, papers), chembl_data = await asyncio.gather(
+            fetch_uniprot_and_literature(),
+            self.fetch_chembl_target(target_id),
+        )
+
         results["data"]["uniprot"] = uniprot_data
         if uniprot_data.get("gene"):
-            print(f"  Gene: {uniprot_data['gene']}")
-            print(f"  Protein: {uniprot_data.get('protein_name', 'N/A')}")
+            self._log("  Gene: %s", uniprot_data["gene"])
+            self._log("  Protein: %s", uniprot_data.get("protein_name", "N/A"))
 
-        # Fetch ChEMBL data
-        print(">>> Fetching ChEMBL data...")
-        chembl_data = await self.fetch_chembl_target(target_id)
         results["data"]["chembl"] = chembl_data
         if chembl_data.get("chembl_id"):
-            print(f"  ChEMBL ID: {chembl_data['chembl_id']}")
+            self._log("  ChEMBL ID: %s", chembl_data["chembl_id"])
 
-        # Search literature
-        gene_name = uniprot_data.get("gene", target_id)
-        print(f">>> Searching PubMed for '{gene_name} drug target'...")
-        papers = await self.search_pubmed(f"{gene_name} drug target", max_results=3)
         results["data"]["literature"] = papers
-        print(f"  Found {len(papers)} relevant papers")
+        self._log("  Found %d relevant papers for '%s drug target'", len(papers), gene_name)
 
         # AI Analysis
-        print(f">>> Running AI analysis...")
-        context = f"""
-TARGET: {target_id}
-
-UNIPROT DATA:
-{json.dumps(uniprot_data, indent=2)}
-
-CHEMBL DATA:
-{json.dumps(chembl_data, indent=2)}
-
-RECENT LITERATURE:
-{json.dumps(papers, indent=2)}
-"""
+        self._log(">>> Running AI analysis...")
+        context = "\n".join([
+            "",
+            f"TARGET: {target_id}",
+            "",
+            "UNIPROT DATA:",
+            orjson.dumps(uniprot_data, option=orjson.OPT_INDENT_2).decode(),
+            "",
+            "CHEMBL DATA:",
+            orjson.dumps(chembl_data, option=orjson.OPT_INDENT_2).decode(),
+            "",
+            "RECENT LITERATURE:",
+            orjson.dumps(papers, option=orjson.OPT_INDENT_2).decode(),
+            "",
+        ])
 
         prompt = f"""Perform a comprehensive druggability analysis for this target:
 
@@ -350,9 +594,7 @@ Provide:
 
         results["analysis"] = await self._llm_query(prompt)
 
-        print("\n" + "=" * 60)
-        print("  ANALYSIS COMPLETE")
-        print("=" * 60)
+        self._log("\n%s\n  ANALYSIS COMPLETE\n%s", rule, rule)
 
         return results
 
@@ -379,6 +621,26 @@ Format as a structured report with confidence levels."""
         analysis = await self._llm_query(prompt)
         return {"smiles": smiles, "analysis": analysis}
 
+    async def _cmd_target(self, target_id: str):
+        results = await self.analyze_target(target_id)
+        print("\n" + results["analysis"])
+
+    async def _cmd_molecule(self, smiles: str):
+        results = await self.predict_properties(smiles)
+        print("\n" + results["analysis"])
+
+    async def _cmd_search(self, query: str):
+        papers = await self.search_pubmed(query, max_results=5)
+        for i, paper in enumerate(papers):
+            print(f"\n[{i+1}] {paper.get('title')}")
+            print(f"    Authors: {', '.join(paper.get('authors', []))}")
+            print(f"    Journal: {paper.get('journal')} ({paper.get('pubdate')})")
+            print(f"    PMID: {paper.get('pmid')}")
+
+    async def _cmd_ask(self, question: str):
+        response = await self._llm_query(question)
+        print(f"\n{response}")
+
     async def interactive_session(self):
         """Run interactive biotech research session"""
         print("\n" + "=" * 60)
@@ -393,44 +655,33 @@ Format as a structured report with confidence levels."""
         print("  quit                  - Exit")
         print("=" * 60 + "\n")
 
+        commands = {
+            "target": self._cmd_target,
+            "molecule": self._cmd_molecule,
+            "search": self._cmd_search,
+            "ask": self._cmd_ask,
+        }
+
         while True:
             try:
-                user_input = input("\nBiotech> ").strip()
+                user_input = (await asyncio.to_thread(input, "\nBiotech> ")).strip()
 
                 if not user_input:
                     continue
 
-                if user_input.lower() == "quit":
+                cmd, _, arg = user_input.partition(" ")
+                cmd = cmd.lower()
+                arg = arg.strip()
+
+                if cmd == "quit" and not arg:
                     print("Exiting...")
                     break
 
-                elif user_input.lower().startswith("target "):
-                    target_id = user_input[7:].strip()
-                    results = await self.analyze_target(target_id)
-                    print("\n" + results["analysis"])
-
-                elif user_input.lower().startswith("molecule "):
-                    smiles = user_input[9:].strip()
-                    results = await self.predict_properties(smiles)
-                    print("\n" + results["analysis"])
-
-                elif user_input.lower().startswith("search "):
-                    query = user_input[7:].strip()
-                    papers = await self.search_pubmed(query, max_results=5)
-                    for i, paper in enumerate(papers):
-                        print(f"\n[{i+1}] {paper.get('title')}")
-                        print(f"    Authors: {', '.join(paper.get('authors', []))}")
-                        print(f"    Journal: {paper.get('journal')} ({paper.get('pubdate')})")
-                        print(f"    PMID: {paper.get('pmid')}")
-
-                elif user_input.lower().startswith("ask "):
-                    question = user_input[4:].strip()
-                    response = await self._llm_query(question)
-                    print(f"\n{response}")
-
+                handler = commands.get(cmd) if arg else None
+                if handler:
+                    await handler(arg)
                 else:
-                    response = await self._llm_query(user_input)
-                    print(f"\n{response}")
+                    await self._cmd_ask(user_input)
 
             except KeyboardInterrupt:
                 print("\nExiting...")
@@ -440,6 +691,10 @@ Format as a structured report with confidence levels."""
 
 
 async def main():
+    import argparse
+
+    configure_logging()
+
     parser = argparse.ArgumentParser(description="CroweLM Biotech Agent")
     parser.add_argument("--target", help="UniProt ID for target analysis")
     parser.add_argument("--molecule", help="SMILES for property prediction")
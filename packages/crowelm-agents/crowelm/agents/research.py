@@ -16,21 +16,47 @@ Usage:
 
 import asyncio
 import aiohttp
-import json
 import argparse
-import re
+import contextlib
+import orjson
+import os
+import time
+import xml.etree.ElementTree as ET
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 
+from crowelm.core import ResponseCache, run_async
 
-@dataclass
+# LLM analyses can take minutes; connect stays short so a dead host fails fast
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=300, connect=5, sock_read=240)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _utc_timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+@dataclass(slots=True)
 class ResearchConfig:
     """Configuration for research agent"""
     model_url: str = "http://localhost:12434/v1"
     model_name: str = "crowelogic/crowelogic:v1.0"
     temperature: float = 0.3
     max_tokens: int = 4096
+    pool_size: int = 256
+    pool_size_per_host: int = 64
+    max_concurrency: int = 8
+    timeout_per_call: float = 120.0  # Upper bound for a single LLM request
+    arxiv_min_interval: float = 3.0  # arXiv API terms: one request every 3 seconds
+    cache_dir: Optional[str] = None  # On-disk LLM response cache (temperature 0 only)
+
+    def __post_init__(self):
+        if self.cache_dir is None:
+            self.cache_dir = os.environ.get("CROWELM_LLM_CACHE") or None
 
 
 class ResearchAgent:
@@ -60,18 +86,56 @@ When analyzing research:
 
 Be precise, analytical, and evidence-based in your responses."""
 
-    def __init__(self, config: Optional[ResearchConfig] = None):
+    # Built once and shared by every request that uses the default system prompt
+    _SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._SYSTEM_MSG = {"role": "system", "content": cls.SYSTEM_PROMPT}
+
+    def __init__(
+        self,
+        config: Optional[ResearchConfig] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+    ):
         self.config = config or ResearchConfig()
+        # An injected connector is shared with other clients and never closed here
+        self._connector = connector
         self._session: Optional[aiohttp.ClientSession] = None
+        self._arxiv_lock = asyncio.Lock()
+        self._arxiv_last = 0.0
+        self._arxiv_warm = 0.0
+        self._response_cache = (
+            ResponseCache(self.config.cache_dir) if self.config.cache_dir else None
+        )
 
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            connector = self._connector
+            if connector is None:
+                # Keep-alive + DNS cache so repeated ArXiv/LLM calls across a
+                # session reuse connections instead of re-handshaking
+                connector = aiohttp.TCPConnector(
+                    limit=self.config.pool_size,
+                    limit_per_host=self.config.pool_size_per_host,
+                    keepalive_timeout=75,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                )
+            self._session = aiohttp.ClientSession(
+                timeout=_DEFAULT_TIMEOUT,
+                connector=connector,
+                connector_owner=self._connector is None,
+                headers={"Accept-Encoding": "gzip, deflate"},
+            )
         return self._session
 
     async def close(self):
         if self._session and not self._session.closed:
             await self._session.close()
+        if self._response_cache:
+            self._response_cache.close()
+            self._response_cache = None
 
     async def __aenter__(self):
         await self._ensure_session()
@@ -87,24 +151,38 @@ Be precise, analytical, and evidence-based in your responses."""
         payload = {
             "model": self.config.model_name,
             "messages": [
-                {"role": "system", "content": system or self.SYSTEM_PROMPT},
+                {"role": "system", "content": system} if system else self._SYSTEM_MSG,
                 {"role": "user", "content": prompt}
             ],
             "temperature": self.config.temperature,
             "max_tokens": self.config.max_tokens,
         }
 
+        # Sampled completions are not a function of the prompt, so only greedy ones are cached
+        cache = self._response_cache if self.config.temperature == 0 else None
+        if cache:
+            # SQLite reads and commits block, so they stay off the event loop
+            cached = await asyncio.to_thread(cache.get, payload)
+            if cached is not None:
+                return cached
+
         try:
             async with session.post(
                 f"{self.config.model_url}/chat/completions",
-                json=payload,
-                headers={"Content-Type": "application/json"}
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout_per_call),
             ) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
-                    return data["choices"][0]["message"]["content"]
+                    data = orjson.loads(await resp.read())
+                    content = data["choices"][0]["message"]["content"]
+                    if cache:
+                        await asyncio.to_thread(cache.set, payload, content)
+                    return content
                 else:
                     return f"Error: {resp.status}"
+        except asyncio.TimeoutError:
+            return f"Error: LLM request timed out after {self.config.timeout_per_call:g}s"
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -121,53 +199,60 @@ Be precise, analytical, and evidence-based in your responses."""
         }
 
         try:
+            async with self._arxiv_lock:
+                # Only back-to-back searches wait; a lone query goes out immediately
+                wait = self._arxiv_last + self.config.arxiv_min_interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._arxiv_last = time.monotonic()
+
             async with session.get(
-                "http://export.arxiv.org/api/query",
+                "https://export.arxiv.org/api/query",
                 params=params
             ) as resp:
                 if resp.status == 200:
-                    text = await resp.text()
-                    papers = self._parse_arxiv_response(text)
+                    papers = self._parse_arxiv_response(await resp.read())
                     return papers
                 return []
         except Exception as e:
             print(f"ArXiv search error: {e}")
             return []
 
-    def _parse_arxiv_response(self, xml_text: str) -> List[Dict]:
-        """Parse ArXiv XML response"""
+    def _parse_arxiv_response(self, xml_text: str | bytes) -> List[Dict]:
+        """Parse ArXiv Atom XML response"""
         papers = []
-        entries = re.findall(r'<entry>(.*?)</entry>', xml_text, re.DOTALL)
+        root = ET.fromstring(xml_text)
 
-        for entry in entries:
+        for entry in root.iter(f"{_ATOM}entry"):
             paper = {}
 
-            title_match = re.search(r'<title>(.*?)</title>', entry, re.DOTALL)
-            if title_match:
-                paper["title"] = title_match.group(1).strip().replace('\n', ' ')
+            title = entry.findtext(f"{_ATOM}title")
+            if title:
+                paper["title"] = title.strip().replace('\n', ' ')
 
-            id_match = re.search(r'<id>(.*?)</id>', entry)
-            if id_match:
-                paper["arxiv_id"] = id_match.group(1).split('/')[-1]
-                paper["url"] = id_match.group(1)
+            entry_id = entry.findtext(f"{_ATOM}id")
+            if entry_id:
+                paper["arxiv_id"] = entry_id.split('/')[-1]
+                paper["url"] = entry_id
 
-            summary_match = re.search(r'<summary>(.*?)</summary>', entry, re.DOTALL)
-            if summary_match:
-                paper["abstract"] = summary_match.group(1).strip().replace('\n', ' ')
+            summary = entry.findtext(f"{_ATOM}summary")
+            if summary:
+                paper["abstract"] = summary.strip().replace('\n', ' ')
 
-            authors = re.findall(r'<name>(.*?)</name>', entry)
-            paper["authors"] = authors[:5]
+            paper["authors"] = [
+                name.text for name in entry.iterfind(f"{_ATOM}author/{_ATOM}name")
+            ][:5]
 
-            published_match = re.search(r'<published>(.*?)</published>', entry)
-            if published_match:
-                paper["published"] = published_match.group(1)[:10]
+            published = entry.findtext(f"{_ATOM}published")
+            if published:
+                paper["published"] = published[:10]
 
             if paper.get("title"):
                 papers.append(paper)
 
         return papers
 
-    async def analyze_paper(self, paper: Dict) -> Dict:
+    async def analyze_paper(self, paper: Dict, analyzed_at: Optional[str] = None) -> Dict:
         """Analyze a scientific paper"""
         prompt = f"""Analyze this scientific paper:
 
@@ -190,7 +275,7 @@ Provide:
         return {
             "paper": paper,
             "analysis": analysis,
-            "analyzed_at": datetime.now().isoformat()
+            "analyzed_at": analyzed_at or _utc_timestamp()
         }
 
     async def research_topic(self, topic: str) -> Dict:
@@ -199,9 +284,11 @@ Provide:
         print(f"  RESEARCHING: {topic}")
         print(f"{'=' * 60}\n")
 
+        # One timestamp for the run, shared by every paper analysed in it
+        started_at = _utc_timestamp()
         results = {
             "topic": topic,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": started_at,
             "papers": [],
             "summary": "",
         }
@@ -211,19 +298,24 @@ Provide:
         papers = await self.search_arxiv(topic, max_results=5)
         print(f"  Found {len(papers)} papers")
 
-        # Step 2: Analyze papers
+        # Step 2: Analyze papers concurrently; the semaphore caps in-flight LLM calls
         print(">>> Analyzing papers...")
+        sem = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def _analyze(paper: Dict) -> Dict:
+            async with sem:
+                return await self.analyze_paper(paper, analyzed_at=started_at)
+
         for i, paper in enumerate(papers[:3]):
             print(f"  [{i+1}/3] {paper.get('title', 'Unknown')[:50]}...")
-            analysis = await self.analyze_paper(paper)
-            results["papers"].append(analysis)
+        results["papers"] = list(await asyncio.gather(*(_analyze(p) for p in papers[:3])))
 
         # Step 3: Synthesize findings
         print(">>> Synthesizing research...")
 
         synthesis_prompt = f"""Based on these research papers about "{topic}":
 
-{json.dumps([p['analysis'] for p in results['papers']], indent=2)[:3000]}
+{orjson.dumps([p['analysis'] for p in results['papers']], option=orjson.OPT_INDENT_2).decode()[:3000]}
 
 Provide a comprehensive research synthesis:
 1. Current State of Research (3-4 sentences)
@@ -240,6 +332,16 @@ Provide a comprehensive research synthesis:
 
         return results
 
+    async def _prewarm_arxiv(self):
+        """Open a keep-alive connection to ArXiv so the next search skips DNS/TLS setup"""
+        session = await self._ensure_session()
+        try:
+            async with session.head("https://export.arxiv.org/") as resp:
+                await resp.release()
+            self._arxiv_warm = time.monotonic()
+        except Exception:
+            pass
+
     async def interactive_session(self):
         """Run interactive research session"""
         print("\n" + "=" * 60)
@@ -253,44 +355,58 @@ Provide a comprehensive research synthesis:
         print("  quit              - Exit")
         print("=" * 60 + "\n")
 
-        while True:
-            try:
-                user_input = input("\nResearch> ").strip()
-
-                if not user_input:
-                    continue
-
-                if user_input.lower() == "quit":
-                    print("Exiting...")
+        prewarm: Optional[asyncio.Task] = None
+        try:
+            while True:
+                try:
+                    # Warm the ArXiv connection while the user types, unless a recent
+                    # request already left one in the keep-alive pool
+                    idle = time.monotonic() - max(self._arxiv_last, self._arxiv_warm)
+                    if idle > 60 and (prewarm is None or prewarm.done()):
+                        prewarm = asyncio.create_task(self._prewarm_arxiv())
+
+                    user_input = (await asyncio.to_thread(input, "\nResearch> ")).strip()
+
+                    if not user_input:
+                        continue
+
+                    if user_input.lower() == "quit":
+                        print("Exiting...")
+                        break
+
+                    elif user_input.lower().startswith("research "):
+                        topic = user_input[9:].strip()
+                        results = await self.research_topic(topic)
+                        print("\n" + results["summary"])
+
+                    elif user_input.lower().startswith("search "):
+                        query = user_input[7:].strip()
+                        papers = await self.search_arxiv(query)
+                        for i, paper in enumerate(papers):
+                            print(f"\n[{i+1}] {paper.get('title', 'Unknown')}")
+                            print(f"    Authors: {', '.join(paper.get('authors', [])[:2])}")
+                            print(f"    ArXiv: {paper.get('arxiv_id', 'N/A')}")
+
+                    elif user_input.lower().startswith("ask "):
+                        question = user_input[4:].strip()
+                        response = await self._llm_query(question)
+                        print(f"\n{response}")
+
+                    else:
+                        response = await self._llm_query(user_input)
+                        print(f"\n{response}")
+
+                except (KeyboardInterrupt, EOFError):
+                    print("\nExiting...")
                     break
-
-                elif user_input.lower().startswith("research "):
-                    topic = user_input[9:].strip()
-                    results = await self.research_topic(topic)
-                    print("\n" + results["summary"])
-
-                elif user_input.lower().startswith("search "):
-                    query = user_input[7:].strip()
-                    papers = await self.search_arxiv(query)
-                    for i, paper in enumerate(papers):
-                        print(f"\n[{i+1}] {paper.get('title', 'Unknown')}")
-                        print(f"    Authors: {', '.join(paper.get('authors', [])[:2])}")
-                        print(f"    ArXiv: {paper.get('arxiv_id', 'N/A')}")
-
-                elif user_input.lower().startswith("ask "):
-                    question = user_input[4:].strip()
-                    response = await self._llm_query(question)
-                    print(f"\n{response}")
-
-                else:
-                    response = await self._llm_query(user_input)
-                    print(f"\n{response}")
-
-            except KeyboardInterrupt:
-                print("\nExiting...")
-                break
-            except Exception as e:
-                print(f"Error: {e}")
+                except Exception as e:
+                    print(f"Error: {e}")
+        finally:
+            # Don't leave a prewarm HEAD running against a session about to close
+            if prewarm is not None and not prewarm.done():
+                prewarm.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await prewarm
 
 
 async def main():
@@ -299,29 +415,32 @@ async def main():
     parser.add_argument("--topic", help="Research topic for comprehensive analysis")
     parser.add_argument("--interactive", "-i", action="store_true", help="Interactive mode")
     parser.add_argument("--model", default="crowelogic/crowelogic:v1.0", help="Model to use")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache")
 
     args = parser.parse_args()
 
     config = ResearchConfig(model_name=args.model)
+    if args.no_cache:
+        config.cache_dir = None
 
+    # --topic and a query can be combined; both run on the same agent session
     async with ResearchAgent(config) as agent:
-        if args.interactive:
+        if args.interactive or not (args.topic or args.query):
             await agent.interactive_session()
-        elif args.topic:
+            return
+        if args.topic:
             results = await agent.research_topic(args.topic)
             print("\n" + "=" * 60)
             print("SYNTHESIS")
             print("=" * 60)
             print(results["summary"])
-        elif args.query:
+        if args.query:
             papers = await agent.search_arxiv(args.query)
             for paper in papers:
                 print(f"\n{paper.get('title')}")
                 print(f"  ArXiv: {paper.get('arxiv_id')}")
                 print(f"  Authors: {', '.join(paper.get('authors', [])[:3])}")
-        else:
-            await agent.interactive_session()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
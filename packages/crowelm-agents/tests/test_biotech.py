@@ -0,0 +1,198 @@
+"""
+Tests for the BiotechAgent response cache and batched PubMed search
+"""
+
+import orjson
+import pytest
+
+from crowelm.agents import biotech
+from crowelm.agents.biotech import BiotechAgent, BiotechConfig, _TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable stand-in for time.monotonic inside the biotech module"""
+    now = [1000.0]
+    monkeypatch.setattr(biotech.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_entry_expires(clock):
+    cache = _TTLCache(maxsize=4, ttl=10)
+    cache.set("P04637", {"gene": "TP53"}, etag='"v1"')
+
+    entry = cache.get("P04637")
+    assert entry.value == {"gene": "TP53"}
+    assert _TTLCache.is_fresh(entry)
+
+    clock[0] += 10
+    stale = cache.get("P04637")
+    # Expired entries stay available for ETag revalidation
+    assert stale is entry
+    assert not _TTLCache.is_fresh(stale)
+    assert _TTLCache.revalidation_headers(stale) == {"If-None-Match": '"v1"'}
+
+
+def test_ttl_cache_set_refreshes_expiry(clock):
+    cache = _TTLCache(maxsize=4, ttl=10)
+    cache.set("a", {"n": 1})
+    clock[0] += 8
+    cache.set("a", {"n": 2})
+    clock[0] += 8
+
+    entry = cache.get("a")
+    assert _TTLCache.is_fresh(entry)
+    assert entry.value == {"n": 2}
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    cache = _TTLCache(maxsize=2, ttl=60)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a").value == {"n": 1}
+    assert cache.get("c").value == {"n": 3}
+
+
+def test_ttl_cache_missing_entry():
+    assert _TTLCache(maxsize=1, ttl=60).get("missing") is None
+    assert not _TTLCache.is_fresh(None)
+    assert _TTLCache.revalidation_headers(None) is None
+
+
+class _FakeResponse:
+    def __init__(self, status: int, body: dict):
+        self.status = status
+        self._body = orjson.dumps(body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class _FakeSession:
+    """Records esummary requests and answers them with canned summaries"""
+
+    def __init__(self, summaries: dict, status: int = 200):
+        self.summaries = summaries
+        self.status = status
+        self.requests = []
+
+    def _respond(self, method: str, url: str, params: dict):
+        self.requests.append((method, url, params))
+        return _FakeResponse(self.status, {"result": self.summaries})
+
+    def get(self, url, params=None):
+        return self._respond("GET", url, params)
+
+    def post(self, url, data=None):
+        return self._respond("POST", url, data)
+
+
+def _summary(pmid: str) -> dict:
+    return {
+        "title": f"Paper {pmid}",
+        "authors": [{"name": f"Author {i}"} for i in range(5)],
+        "source": "J Test",
+        "pubdate": "2024",
+    }
+
+
+@pytest.fixture
+def pubmed_agent(monkeypatch):
+    """BiotechAgent whose esearch results come from ``agent.id_lists``"""
+    agent = BiotechAgent(BiotechConfig(verbose=False, ncbi_api_key="key"))
+    agent.id_lists = {}
+    agent.session = _FakeSession({})
+
+    async def esearch(session, base_params, query, max_results):
+        return agent.id_lists[query][:max_results]
+
+    async def no_throttle():
+        pass
+
+    async def ensure_session():
+        return agent.session
+
+    monkeypatch.setattr(agent, "_pubmed_esearch", esearch)
+    monkeypatch.setattr(agent, "_ncbi_throttle", no_throttle)
+    monkeypatch.setattr(agent, "_ensure_session", ensure_session)
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_search_pubmed_batch_maps_summaries_to_queries(pubmed_agent):
+    pubmed_agent.id_lists = {"EGFR": ["1", "2"], "KRAS": ["2", "3", "4"], "none": []}
+    # PMID 4 has no summary and is dropped
+    pubmed_agent.session = _FakeSession({pid: _summary(pid) for pid in ("1", "2", "3")})
+
+    results = await pubmed_agent.search_pubmed_batch(["EGFR", "KRAS", "none"])
+
+    assert list(results) == ["EGFR", "KRAS", "none"]
+    assert [p["pmid"] for p in results["EGFR"]] == ["1", "2"]
+    assert [p["pmid"] for p in results["KRAS"]] == ["2", "3"]
+    assert results["none"] == []
+    assert results["EGFR"][0] == {
+        "pmid": "1",
+        "title": "Paper 1",
+        "authors": ["Author 0", "Author 1", "Author 2"],
+        "journal": "J Test",
+        "pubdate": "2024",
+    }
+
+    # One esummary lookup for every query, with shared PMIDs sent once
+    [(method, url, params)] = pubmed_agent.session.requests
+    assert method == "GET"
+    assert url.endswith("/esummary.fcgi")
+    assert params["id"] == "1,2,3,4"
+    assert params["api_key"] == "key"
+
+
+@pytest.mark.asyncio
+async def test_search_pubmed_batch_posts_long_id_lists(pubmed_agent):
+    ids = [str(i) for i in range(BiotechAgent.PUBMED_POST_THRESHOLD + 1)]
+    pubmed_agent.id_lists = {"a": ids[:15], "b": ids[15:]}
+    pubmed_agent.session = _FakeSession({pid: _summary(pid) for pid in ids})
+
+    results = await pubmed_agent.search_pubmed_batch(["a", "b"], max_results=50)
+
+    assert [len(results["a"]), len(results["b"])] == [15, len(ids) - 15]
+    [(method, _, params)] = pubmed_agent.session.requests
+    assert method == "POST"
+    assert params["id"] == ",".join(ids)
+
+
+@pytest.mark.asyncio
+async def test_search_pubmed_batch_skips_summary_without_hits(pubmed_agent):
+    pubmed_agent.id_lists = {"a": [], "b": []}
+
+    results = await pubmed_agent.search_pubmed_batch(["a", "b"])
+
+    assert results == {"a": [], "b": []}
+    assert pubmed_agent.session.requests == []
+
+
+@pytest.mark.asyncio
+async def test_search_pubmed_batch_summary_error_returns_empty(pubmed_agent):
+    pubmed_agent.id_lists = {"a": ["1"]}
+    pubmed_agent.session = _FakeSession({"1": _summary("1")}, status=503)
+
+    assert await pubmed_agent.search_pubmed_batch(["a"]) == {"a": []}
+
+
+@pytest.mark.asyncio
+async def test_search_pubmed_delegates_to_batch(pubmed_agent):
+    pubmed_agent.id_lists = {"TP53": ["7"]}
+    pubmed_agent.session = _FakeSession({"7": _summary("7")})
+
+    papers = await pubmed_agent.search_pubmed("TP53", max_results=3)
+
+    assert [p["pmid"] for p in papers] == ["7"]
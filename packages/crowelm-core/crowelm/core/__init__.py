@@ -2,7 +2,10 @@
 CroweLM Core - Shared utilities and configuration for CroweLM platform.
 """
 
+from .cache import ResponseCache
 from .config import CroweLMConfig, ModelConfig
+from .log import configure_logging
+from .runtime import run_async
 from .version import __version__
 
-__all__ = ["CroweLMConfig", "ModelConfig", "__version__"]
+__all__ = ["CroweLMConfig", "ModelConfig", "ResponseCache", "configure_logging", "run_async", "__version__"]
@@ -0,0 +1,58 @@
+"""
+CroweLM Response Cache - Persistent exact-match cache for LLM and NIM responses.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """
+    SQLite-backed memo of request payload -> JSON response.
+
+    Keys are a hash of the canonical JSON payload, so any change to the model,
+    prompt or sampling parameters is a miss. Only deterministic requests
+    should be cached; callers decide that before calling ``get``/``set``.
+
+    Async callers run ``get``/``set`` in worker threads, so the connection is
+    shared across threads and every statement is serialized by a lock.
+    """
+
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(cache_dir, "responses.sqlite"), check_same_thread=False
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def key(payload: Dict) -> str:
+        """Stable digest of a request payload"""
+        blob = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+    def get(self, payload: Dict) -> Optional[Any]:
+        key = self.key(payload)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, payload: Dict, value: Any):
+        row = (self.key(payload), json.dumps(value))
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", row)
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
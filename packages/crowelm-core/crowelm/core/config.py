@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelConfig:
     """Configuration for LLM model endpoints."""
 
@@ -29,7 +29,7 @@ class ModelConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class NVIDIAConfig:
     """Configuration for NVIDIA NIMs integration."""
 
@@ -49,7 +49,7 @@ class NVIDIAConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CroweLMConfig:
     """Master configuration for CroweLM platform."""
 
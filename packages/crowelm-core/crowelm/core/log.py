@@ -0,0 +1,37 @@
+"""
+CroweLM Logging - Console logging setup shared by the CroweLM CLI entry points.
+"""
+
+import logging
+import sys
+
+LOGGER_NAME = "crowelm"
+
+
+def configure_logging(level: str = "INFO", fmt: str = "%(message)s") -> logging.Logger:
+    """
+    Send ``crowelm.*`` progress logs to stdout.
+
+    Library code only emits log records; CLI entry points call this once so
+    the records show up alongside the command's printed results. Calling it
+    again just updates the level.
+
+    Args:
+        level: Logging level name (e.g. "INFO", "WARNING").
+        fmt: Log record format.
+
+    Returns:
+        The configured ``crowelm`` logger.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+
+    if not any(getattr(h, "_crowelm_console", False) for h in logger.handlers):
+        # Written synchronously so progress lines stay ordered with print() output
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter(fmt))
+        handler._crowelm_console = True
+        logger.addHandler(handler)
+        logger.propagate = False
+
+    return logger
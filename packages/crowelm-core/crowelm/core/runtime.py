@@ -0,0 +1,21 @@
+"""
+CroweLM Runtime - Event loop entry point shared by the async CLIs.
+"""
+
+import asyncio
+from typing import Any, Coroutine
+
+
+def run_async(main: Coroutine) -> Any:
+    """
+    Run ``main`` to completion, on uvloop when it is installed.
+
+    uvloop is an optional extra (not available on Windows); without it this
+    is plain ``asyncio.run``.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+
+    return uvloop.run(main)
@@ -18,25 +18,43 @@ Usage:
 
 import asyncio
 import aiohttp
-import json
+import orjson
 import os
+import random
 import base64
-from typing import Dict, List, Optional, Any
+import contextlib
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from crowelm.core import ResponseCache, run_async
 
-@dataclass
+try:
+    # SIMD base64 (crowelm-nims[fast]); PDB payloads run to megabytes
+    from pybase64 import b64encode_as_string as _b64encode
+except ImportError:
+    def _b64encode(data: bytes) -> str:
+        return base64.b64encode(data).decode()
+
+
+@dataclass(slots=True)
 class NVIDIAConfig:
     """Configuration for NVIDIA NIMs"""
     api_key: str = ""
     biology_url: str = "https://health.api.nvidia.com/v1"
     llm_url: str = "https://integrate.api.nvidia.com/v1"
     timeout: int = 300
+    timeout_per_call: float = 120.0  # Upper bound for a single NIM/chat request
+    max_retries: int = 4  # Extra attempts for transient failures
+    pool_size: int = 256
+    pool_size_per_host: int = 64
+    cache_dir: Optional[str] = None  # On-disk NIM response cache
 
     def __post_init__(self):
         if not self.api_key:
             self.api_key = os.environ.get("NVIDIA_API_KEY", "")
+        if self.cache_dir is None:
+            self.cache_dir = os.environ.get("CROWELM_LLM_CACHE") or None
 
 
 class NVIDIANIMs:
@@ -61,28 +79,80 @@ class NVIDIANIMs:
         "chat_fast": "nvidia/nemotron-mini-4b-instruct",
     }
 
-    def __init__(self, config: Optional[NVIDIAConfig] = None):
+    # Concurrent embed() calls are coalesced into one ESM2 request
+    EMBED_BATCH_SIZE = 32
+    EMBED_MAX_WAIT = 0.005
+
+    HEALTH_PROBE_TIMEOUT = 10
+
+    # Only deterministic endpoints are served from the response cache; MolMIM,
+    # DiffDock and ProteinMPNN sample, so repeating a payload must rerun them
+    CACHEABLE_ENDPOINTS = frozenset({"nvidia/esmfold", "esm2/embeddings"})
+
+    # Transient statuses worth retrying; other 4xx are returned immediately
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    RETRY_MAX_WAIT = 20
+
+    def __init__(
+        self,
+        config: Optional[NVIDIAConfig] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+    ):
         self.config = config or NVIDIAConfig()
+        # An injected connector is shared with other clients and never closed here
+        self._connector = connector
         self._session: Optional[aiohttp.ClientSession] = None
+        self._embed_queue: Optional[asyncio.Queue] = None
+        self._embed_worker: Optional[asyncio.Task] = None
 
         if not self.config.api_key:
             raise ValueError("NVIDIA_API_KEY environment variable not set")
 
+        # Request headers and endpoint prefixes are fixed for the client's lifetime
+        self._headers = {
+            "Authorization": f"Bearer {self.config.api_key}",
+            "Content-Type": "application/json",
+        }
+        self._biology_base = f"{self.config.biology_url}/biology/"
+        self._chat_url = f"{self.config.llm_url}/chat/completions"
+        self._call_timeout = aiohttp.ClientTimeout(total=self.config.timeout_per_call)
+        self._response_cache = (
+            ResponseCache(self.config.cache_dir) if self.config.cache_dir else None
+        )
+
     async def _ensure_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+            connector = self._connector
+            if connector is None:
+                # Keep-alive + DNS cache so back-to-back NIM calls reuse the
+                # TLS connection to health/integrate.api.nvidia.com
+                connector = aiohttp.TCPConnector(
+                    limit=self.config.pool_size,
+                    limit_per_host=self.config.pool_size_per_host,
+                    keepalive_timeout=75,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                )
+            timeout = aiohttp.ClientTimeout(total=self.config.timeout, connect=5)
             self._session = aiohttp.ClientSession(
                 timeout=timeout,
-                headers={
-                    "Authorization": f"Bearer {self.config.api_key}",
-                    "Content-Type": "application/json",
-                }
+                connector=connector,
+                connector_owner=self._connector is None,
+                headers=self._headers,
             )
         return self._session
 
     async def close(self):
+        if self._embed_worker:
+            self._embed_worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._embed_worker
+            self._embed_worker = None
         if self._session and not self._session.closed:
             await self._session.close()
+        if self._response_cache:
+            self._response_cache.close()
+            self._response_cache = None
 
     async def __aenter__(self):
         await self._ensure_session()
@@ -91,24 +161,57 @@ class NVIDIANIMs:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
 
+    async def _post(self, url: str, payload: Dict) -> Tuple[int, bytes]:
+        """POST JSON, retrying connection errors, 429 and 5xx with jittered backoff"""
+        session = await self._ensure_session()
+        body = orjson.dumps(payload)
+        retries = self.config.max_retries
+
+        for attempt in range(retries + 1):
+            try:
+                async with session.post(url, data=body, timeout=self._call_timeout) as resp:
+                    status, content = resp.status, await resp.read()
+                if status not in self.RETRY_STATUSES or attempt == retries:
+                    return status, content
+            except asyncio.TimeoutError:
+                # A timed-out job may still be running on the NIM; resubmitting
+                # would queue the same GPU work again, so a timeout ends the call
+                raise
+            except aiohttp.ClientError:
+                if attempt == retries:
+                    raise
+            # Full jitter keeps concurrent pipeline stages from retrying in lockstep
+            await asyncio.sleep(random.uniform(0, min(self.RETRY_MAX_WAIT, 0.5 * 2 ** attempt)))
+
     async def _call_nim(self, endpoint: str, payload: Dict) -> Dict:
         """Call a NVIDIA NIM biology endpoint"""
-        session = await self._ensure_session()
-        url = f"{self.config.biology_url}/biology/{endpoint}"
+        url = self._biology_base + endpoint
+
+        cache = self._response_cache if endpoint in self.CACHEABLE_ENDPOINTS else None
+        key = {"endpoint": endpoint, **payload}
+        if cache:
+            # SQLite reads and commits block, so they stay off the event loop
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                return cached
 
         try:
-            async with session.post(url, json=payload) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                else:
-                    error_text = await resp.text()
-                    return {"error": f"NVIDIA NIM error ({resp.status}): {error_text}"}
+            status, content = await self._post(url, payload)
+            if status == 200:
+                result = orjson.loads(content)
+                if cache:
+                    await asyncio.to_thread(cache.set, key, result)
+                return result
+            else:
+                error_text = content.decode(errors="replace")
+                return {"error": f"NVIDIA NIM error ({status}): {error_text}"}
+        except asyncio.TimeoutError:
+            return {"error": f"NVIDIA NIM {endpoint} timed out after {self.config.timeout_per_call:g}s"}
         except Exception as e:
             return {"error": str(e)}
 
     async def _call_chat(self, messages: List[Dict], model: str = None) -> str:
         """Call NVIDIA chat endpoint (LLMs)"""
-        session = await self._ensure_session()
         model = model or self.ENDPOINTS["chat"]
 
         payload = {
@@ -119,15 +222,14 @@ class NVIDIANIMs:
         }
 
         try:
-            async with session.post(
-                f"{self.config.llm_url}/chat/completions",
-                json=payload
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data["choices"][0]["message"]["content"]
-                else:
-                    return f"Error: {resp.status}"
+            status, content = await self._post(self._chat_url, payload)
+            if status == 200:
+                data = orjson.loads(content)
+                return data["choices"][0]["message"]["content"]
+            else:
+                return f"Error: {status}"
+        except asyncio.TimeoutError:
+            return f"Error: chat request timed out after {self.config.timeout_per_call:g}s"
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -175,7 +277,7 @@ class NVIDIANIMs:
         print(f"  Ligand: {ligand_smiles[:30]}...")
         print(f"  Poses: {num_poses}")
 
-        protein_b64 = base64.b64encode(protein_pdb.encode()).decode()
+        protein_b64 = _b64encode(protein_pdb.encode())
 
         payload = {
             "protein": protein_b64,
@@ -211,7 +313,7 @@ class NVIDIANIMs:
             smi: Optional seed SMILES molecule
 
         Returns:
-            Generated SMILES with properties
+            Generated SMILES with properties, best score first
         """
         print(f">>> Generating {num_molecules} molecules with MolMIM...")
         print(f"  Algorithm: {algorithm}")
@@ -236,10 +338,14 @@ class NVIDIANIMs:
             molecules_str = result.get("molecules", "[]")
             if isinstance(molecules_str, str):
                 try:
-                    molecules = json.loads(molecules_str)
+                    molecules = orjson.loads(molecules_str)
                     result["molecules"] = molecules
                 except:
                     pass
+            molecules = result.get("molecules")
+            if isinstance(molecules, list) and all(isinstance(m, dict) for m in molecules):
+                # Rank once here so callers take top-K as a slice instead of re-sorting
+                molecules.sort(key=lambda m: m.get("score") or 0, reverse=True)
             n_mols = len(result.get("molecules", []))
             print(f"  [OK] Generated {n_mols} molecules")
 
@@ -265,6 +371,68 @@ class NVIDIANIMs:
 
         return result
 
+    async def embed(self, sequence: str) -> List[float]:
+        """
+        Get the ESM2 embedding for one sequence.
+
+        Calls made concurrently are batched into a single NIM request of up
+        to ``EMBED_BATCH_SIZE`` sequences.
+
+        Args:
+            sequence: Amino acid sequence
+
+        Returns:
+            Embedding vector
+        """
+        if self._embed_worker is None or self._embed_worker.done():
+            self._embed_queue = asyncio.Queue()
+            self._embed_worker = asyncio.create_task(self._embed_loop())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._embed_queue.put((sequence, future))
+        return await future
+
+    async def _embed_loop(self):
+        loop = asyncio.get_running_loop()
+        queue = self._embed_queue
+        batch = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.EMBED_MAX_WAIT
+                while len(batch) < self.EMBED_BATCH_SIZE:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                result = await self._call_nim(
+                    "esm2/embeddings", {"sequences": [seq for seq, _ in batch]}
+                )
+                embeddings = result.get("embeddings")
+                if "error" in result or not embeddings or len(embeddings) != len(batch):
+                    error = RuntimeError(result.get("error", "Unexpected ESM2 embeddings response"))
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(error)
+                    continue
+
+                for (_, future), embedding in zip(batch, embeddings):
+                    if not future.done():
+                        future.set_result(embedding)
+        finally:
+            # Stopped by close(): fail the batch in flight and everything still
+            # queued so no embed() caller is left waiting
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            error = RuntimeError("NVIDIA NIMs client closed before the embedding was computed")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+
     async def design_protein(
         self,
         pdb_structure: str,
@@ -285,7 +453,7 @@ class NVIDIANIMs:
         print(f">>> Designing proteins with ProteinMPNN...")
         print(f"  Sequences to generate: {num_sequences}")
 
-        pdb_b64 = base64.b64encode(pdb_structure.encode()).decode()
+        pdb_b64 = _b64encode(pdb_structure.encode())
 
         payload = {
             "pdb": pdb_b64,
@@ -323,55 +491,54 @@ class NVIDIANIMs:
 
         return await self._call_chat(messages)
 
-    async def health_check(self) -> Dict[str, Any]:
-        """Check health of NVIDIA NIM services"""
+    async def _probe(self, method: str, url: str, payload: Optional[Dict] = None) -> bool:
+        """True if a single request to ``url`` answers 200 within HEALTH_PROBE_TIMEOUT"""
         session = await self._ensure_session()
 
-        results = {
-            "llm_api": False,
-            "biology_api": False,
-            "available_services": []
-        }
+        async def _request() -> bool:
+            async with session.request(method, url, json=payload) as resp:
+                return resp.status == 200
 
         try:
-            async with session.get(f"{self.config.llm_url}/models") as resp:
-                results["llm_api"] = resp.status == 200
-        except:
-            pass
+            return await asyncio.wait_for(_request(), self.HEALTH_PROBE_TIMEOUT)
+        except Exception:
+            return False
 
-        try:
-            async with session.post(
-                f"{self.config.biology_url}/biology/nvidia/molmim/generate",
-                json={"smi": "CCO", "num_molecules": 1, "algorithm": "CMA-ES",
-                      "property_name": "QED", "iterations": 1, "particles": 5}
-            ) as resp:
-                if resp.status == 200:
-                    results["biology_api"] = True
-                    results["available_services"].append("molmim")
-        except:
-            pass
+    async def health_check(self) -> Dict[str, Any]:
+        """Check health of NVIDIA NIM services"""
+        # Probes are independent, so a dead service only costs its own timeout
+        llm_ok, molmim_ok, esmfold_ok = await asyncio.gather(
+            self._probe("GET", f"{self.config.llm_url}/models"),
+            self._probe(
+                "POST",
+                self._biology_base + "nvidia/molmim/generate",
+                {"smi": "CCO", "num_molecules": 1, "algorithm": "CMA-ES",
+                 "property_name": "QED", "iterations": 1, "particles": 5},
+            ),
+            self._probe("POST", self._biology_base + "nvidia/esmfold", {"sequence": "MVLSPA"}),
+        )
 
-        try:
-            async with session.post(
-                f"{self.config.biology_url}/biology/nvidia/esmfold",
-                json={"sequence": "MVLSPA"}
-            ) as resp:
-                if resp.status == 200:
-                    results["available_services"].append("esmfold")
-        except:
-            pass
+        results = {
+            "llm_api": llm_ok,
+            "biology_api": molmim_ok,
+            "available_services": []
+        }
+        if molmim_ok:
+            results["available_services"].append("molmim")
+        if esmfold_ok:
+            results["available_services"].append("esmfold")
 
         return results
 
 
-async def test_nvidia_nims():
+async def test_nvidia_nims(config: Optional[NVIDIAConfig] = None):
     """Test NVIDIA NIMs integration"""
     print("\n" + "=" * 60)
     print("  NVIDIA NIMs Integration Test")
     print("  Enterprise Molecular AI Services")
     print("=" * 60 + "\n")
 
-    async with NVIDIANIMs() as nims:
+    async with NVIDIANIMs(config) as nims:
         print(">>> Checking API access...")
         health = await nims.health_check()
         print(f"  LLM API (integrate.api): {'[OK]' if health.get('llm_api') else '[X]'}")
@@ -412,8 +579,8 @@ async def test_nvidia_nims():
             if "error" not in result:
                 pdbs = result.get("pdbs", [])
                 if pdbs:
-                    pdb_lines = pdbs[0].split('\n')
-                    atom_count = sum(1 for l in pdb_lines if l.startswith("ATOM"))
+                    pdb = pdbs[0]
+                    atom_count = pdb.count("\nATOM") + pdb.startswith("ATOM")
                     print(f"  PDB atoms: {atom_count}")
             else:
                 print(f"  Error: {result.get('error')}")
@@ -431,26 +598,30 @@ async def main():
     parser.add_argument("--structure", help="Predict structure for sequence")
     parser.add_argument("--generate", type=int, help="Generate N molecules")
     parser.add_argument("--chat", help="Ask scientific question")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the NIM response cache")
 
     args = parser.parse_args()
 
-    if args.test:
-        await test_nvidia_nims()
-    elif args.structure:
-        async with NVIDIANIMs() as nims:
+    config = NVIDIAConfig()
+    if args.no_cache:
+        config.cache_dir = None
+
+    if args.test or not (args.structure or args.generate or args.chat):
+        await test_nvidia_nims(config)
+        return
+
+    # One client (and connection pool) for every operation requested on the command line
+    async with NVIDIANIMs(config) as nims:
+        if args.structure:
             result = await nims.predict_structure_esmfold(args.structure)
-            print(json.dumps(result, indent=2))
-    elif args.generate:
-        async with NVIDIANIMs() as nims:
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+        if args.generate:
             result = await nims.generate_molecules(num_molecules=args.generate)
-            print(json.dumps(result, indent=2))
-    elif args.chat:
-        async with NVIDIANIMs() as nims:
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+        if args.chat:
             response = await nims.science_chat(args.chat)
             print(response)
-    else:
-        await test_nvidia_nims()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -0,0 +1,198 @@
+"""
+Tests for the NVIDIA NIMs HTTP retry loop and response cache
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from crowelm.nims import nvidia
+from crowelm.nims.nvidia import NVIDIAConfig, NVIDIANIMs
+
+
+class _FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self) -> bytes:
+        return b'{"status": %d}' % self.status
+
+
+class _FakeSession:
+    """Plays back one outcome per POST: a status code or an exception to raise"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.posts = 0
+
+    def post(self, url, data=None, timeout=None):
+        self.posts += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return _FakeResponse(outcome)
+
+
+@pytest.fixture
+def backoff(monkeypatch):
+    """Record backoff sleeps instead of waiting; jitter always picks the upper bound"""
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(nvidia.asyncio, "sleep", sleep)
+    monkeypatch.setattr(nvidia.random, "uniform", lambda low, high: high)
+    return delays
+
+
+def _client(monkeypatch, outcomes, max_retries: int = 2):
+    monkeypatch.delenv("CROWELM_LLM_CACHE", raising=False)
+    nims = NVIDIANIMs(NVIDIAConfig(api_key="test-key", max_retries=max_retries))
+    session = _FakeSession(outcomes)
+
+    async def ensure_session():
+        return session
+
+    monkeypatch.setattr(nims, "_ensure_session", ensure_session)
+    return nims, session
+
+
+@pytest.mark.asyncio
+async def test_post_retries_transient_statuses(monkeypatch, backoff):
+    nims, session = _client(monkeypatch, [503, 429, 200])
+
+    status, content = await nims._post("https://nim.test/esmfold", {"sequence": "MK"})
+
+    assert (status, content) == (200, b'{"status": 200}')
+    assert session.posts == 3
+    assert backoff == [0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_post_returns_last_status_when_retries_exhausted(monkeypatch, backoff):
+    nims, session = _client(monkeypatch, [502, 503, 504], max_retries=2)
+
+    status, content = await nims._post("https://nim.test/esmfold", {})
+
+    assert (status, content) == (504, b'{"status": 504}')
+    assert session.posts == 3
+    assert backoff == [0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_post_raises_when_connection_retries_exhausted(monkeypatch, backoff):
+    errors = [aiohttp.ClientConnectionError(f"refused {i}") for i in range(3)]
+    nims, session = _client(monkeypatch, errors, max_retries=2)
+
+    with pytest.raises(aiohttp.ClientConnectionError, match="refused 2"):
+        await nims._post("https://nim.test/esmfold", {})
+
+    assert session.posts == 3
+    assert backoff == [0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_post_recovers_after_connection_error(monkeypatch, backoff):
+    nims, session = _client(monkeypatch, [aiohttp.ClientConnectionError("reset"), 200])
+
+    status, _ = await nims._post("https://nim.test/esmfold", {})
+
+    assert status == 200
+    assert session.posts == 2
+    assert backoff == [0.5]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "timeout", [asyncio.TimeoutError(), aiohttp.ServerTimeoutError("read timeout")]
+)
+async def test_post_does_not_retry_timeouts(monkeypatch, backoff, timeout):
+    nims, session = _client(monkeypatch, [timeout, 200])
+
+    with pytest.raises(asyncio.TimeoutError):
+        await nims._post("https://nim.test/esmfold", {})
+
+    assert session.posts == 1
+    assert backoff == []
+
+
+@pytest.mark.asyncio
+async def test_post_does_not_retry_client_errors(monkeypatch, backoff):
+    nims, session = _client(monkeypatch, [400, 200])
+
+    status, _ = await nims._post("https://nim.test/esmfold", {})
+
+    assert status == 400
+    assert session.posts == 1
+    assert backoff == []
+
+
+@pytest.mark.asyncio
+async def test_post_backoff_is_capped(monkeypatch, backoff):
+    nims, session = _client(monkeypatch, [503] * 8, max_retries=7)
+
+    status, _ = await nims._post("https://nim.test/esmfold", {})
+
+    assert status == 503
+    assert backoff == [0.5, 1.0, 2.0, 4.0, 8.0, 16.0, NVIDIANIMs.RETRY_MAX_WAIT]
+
+
+@pytest.mark.asyncio
+async def test_call_nim_caches_deterministic_endpoints_only(monkeypatch, tmp_path):
+    nims = NVIDIANIMs(NVIDIAConfig(api_key="test-key", cache_dir=str(tmp_path)))
+    posted = []
+
+    async def post(url, payload):
+        posted.append(url)
+        return 200, b'{"pdbs": ["MODEL"]}'
+
+    monkeypatch.setattr(nims, "_post", post)
+    for _ in range(2):
+        assert await nims._call_nim("nvidia/esmfold", {"sequence": "MK"}) == {"pdbs": ["MODEL"]}
+        await nims._call_nim("nvidia/molmim/generate", {"num_molecules": 1})
+
+    assert [url.rsplit("/biology/", 1)[1] for url in posted] == [
+        "nvidia/esmfold",
+        "nvidia/molmim/generate",
+        "nvidia/molmim/generate",
+    ]
+
+    cache = nims._response_cache
+    await nims.close()
+    assert nims._response_cache is None
+    with pytest.raises(Exception, match="closed"):
+        cache.get({"endpoint": "nvidia/esmfold", "sequence": "MK"})
+
+
+@pytest.mark.asyncio
+async def test_close_fails_pending_embeddings(monkeypatch):
+    monkeypatch.delenv("CROWELM_LLM_CACHE", raising=False)
+    nims = NVIDIANIMs(NVIDIAConfig(api_key="test-key"))
+    started = asyncio.Event()
+
+    async def stalled_call(endpoint, payload):
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(nims, "_call_nim", stalled_call)
+    monkeypatch.setattr(NVIDIANIMs, "EMBED_BATCH_SIZE", 1)
+
+    # The first call is in flight with the NIM; the second is still queued
+    in_flight = asyncio.ensure_future(nims.embed("MKT"))
+    await started.wait()
+    queued = asyncio.ensure_future(nims.embed("MKV"))
+    await asyncio.sleep(0)
+
+    await nims.close()
+
+    for call in (in_flight, queued):
+        with pytest.raises(RuntimeError, match="closed"):
+            await asyncio.wait_for(call, 1)
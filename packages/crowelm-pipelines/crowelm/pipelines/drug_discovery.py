@@ -20,16 +20,24 @@ Usage:
 
 import asyncio
 import aiohttp
-import json
+import gzip
+import heapq
+import logging
+import orjson
 import os
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass
 
 from crowelm.nims import NVIDIANIMs, NVIDIAConfig
 from crowelm.agents import BiotechAgent, BiotechConfig
+from crowelm.core import configure_logging, run_async
+
+logger = logging.getLogger(__name__)
 
 # Visualization imports with graceful fallback
 try:
@@ -55,6 +63,74 @@ except ImportError:
     def get_installation_instructions():
         return "Install visualization dependencies: pip install crowelm-pipelines[viz]"
 
+# RDKit (from the [viz] extra) lets ligand dedup see through SMILES spelling differences
+try:
+    from rdkit import Chem
+except ImportError:
+    Chem = None
+
+
+# Markdown report sections; each ends with a blank line once joined
+_REPORT_HEADER = """\
+# Drug Discovery Report: {target}
+Generated: {timestamp}
+
+## Target Information
+- **Gene**: {gene}
+- **Protein**: {protein}
+- **Organism**: {organism}
+- **Length**: {length} residues
+"""
+
+_REPORT_STRUCTURE = """\
+## Structure Prediction
+- **Method**: ESMFold (NVIDIA NIM)
+- **PDB File**: {pdb_file}
+"""
+
+_REPORT_LIGANDS = """\
+## Generated Ligands
+- **Method**: MolMIM (NVIDIA NIM)
+- **Seed**: {seed}
+- **Property Optimized**: {property}
+
+| Rank | SMILES | QED Score |
+|------|--------|-----------|
+{rows}
+"""
+
+_REPORT_ASSESSMENT = """\
+## AI Druggability Assessment
+
+{assessment}
+"""
+
+_REPORT_VISUALIZATIONS = """\
+## Visualizations
+
+{links}
+"""
+
+
+_STAGE_RULE = "-" * 70
+_PREWARM_TIMEOUT = aiohttp.ClientTimeout(total=5)
+# pyplot and rcParams are process-global; batch targets render charts from
+# several worker threads, so chart rendering is serialized
+_CHART_LOCK = threading.Lock()
+
+
+def _canonical_smiles(smiles: str) -> str:
+    """Canonical form of a SMILES string, or the input if RDKit is missing or can't parse it"""
+    if Chem is None or not smiles:
+        return smiles
+    mol = Chem.MolFromSmiles(smiles)
+    return Chem.MolToSmiles(mol) if mol is not None else smiles
+
+
+def _canonical_smiles_batch(smiles: List[str]) -> List[str]:
+    """Canonicalize a chunk of SMILES in a worker process"""
+    return [_canonical_smiles(s) for s in smiles]
+
 
 @dataclass
 class PipelineConfig:
@@ -64,6 +140,14 @@ class PipelineConfig:
     local_model: str = "crowelogic/crowelogic:v1.0"
     output_dir: str = "./pipeline_results"
     render_images: bool = False  # Generate visualizations (requires viz dependencies)
+    http_cache: bool = True  # Reuse UniProt/ChEMBL/PubMed responses across runs (needs [cache] extra)
+    cache_ttl_seconds: int = 86400
+    ligand_parallelism: int = 4  # Concurrent MolMIM runs the ligand budget is split across
+    max_concurrent_esmfold: int = 2  # In-flight ESMFold requests across all targets
+    max_concurrent_molmim: int = 8  # In-flight MolMIM requests across all targets
+    compress_results: bool = True  # Write results as .json.gz
+    prewarm_connections: bool = True  # Open connections to every upstream host on entry
+    max_concurrent_targets: int = 4  # Targets a batch run processes at once
 
     def __post_init__(self):
         if not self.nvidia_api_key:
@@ -80,23 +164,56 @@ class DrugDiscoveryPipeline:
     - Public databases (UniProt, ChEMBL, PubMed)
     """
 
+    # Below this many SMILES, process start-up costs more than RDKit parsing
+    CANONICALIZE_POOL_MIN = 100
+    # Generation rounds used to top up ligands lost to deduplication
+    LIGAND_ROUNDS = 3
+
     def __init__(self, config: Optional[PipelineConfig] = None):
         self.config = config or PipelineConfig()
         self.nvidia_nims: Optional[NVIDIANIMs] = None
         self.biotech_agent: Optional[BiotechAgent] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        # Per-endpoint caps so fan-out stays under NIM rate limits
+        self._esmfold_sem = asyncio.Semaphore(self.config.max_concurrent_esmfold)
+        self._molmim_sem = asyncio.Semaphore(self.config.max_concurrent_molmim)
+        # PubMed results prefetched by run_batch_pipeline, keyed by query
+        self._literature: Dict[str, List[Dict]] = {}
+        # Created once in __aenter__; writers only format file names under it
+        self._out = Path(self.config.output_dir)
+        # RDKit workers, started on the first ligand set large enough to need them
+        self._pool: Optional[ProcessPoolExecutor] = None
 
     async def __aenter__(self):
+        self._out.mkdir(parents=True, exist_ok=True)
+
+        # One keep-alive pool shared by the NIM client and the biotech agent
+        self._connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=32,
+            keepalive_timeout=75,
+            ttl_dns_cache=600,
+            enable_cleanup_closed=True,
+        )
+
         nvidia_config = NVIDIAConfig(api_key=self.config.nvidia_api_key)
-        self.nvidia_nims = NVIDIANIMs(nvidia_config)
+        self.nvidia_nims = NVIDIANIMs(nvidia_config, connector=self._connector)
         await self.nvidia_nims._ensure_session()
 
         biotech_config = BiotechConfig(
             model_url=self.config.local_model_url,
-            model_name=self.config.local_model
+            model_name=self.config.local_model,
+            cache_ttl=self.config.cache_ttl_seconds,
         )
-        self.biotech_agent = BiotechAgent(biotech_config)
+        if self.config.http_cache:
+            # Lives next to the results so repeated runs on a target skip the network
+            biotech_config.cache_path = str(self._out / ".http_cache.sqlite")
+        self.biotech_agent = BiotechAgent(biotech_config, connector=self._connector)
         await self.biotech_agent._ensure_session()
 
+        if self.config.prewarm_connections:
+            await self._prewarm_connections(nvidia_config)
+
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -104,6 +221,30 @@ class DrugDiscoveryPipeline:
             await self.nvidia_nims.close()
         if self.biotech_agent:
             await self.biotech_agent.close()
+        if self._connector:
+            await self._connector.close()
+        if self._pool:
+            self._pool.shutdown(wait=False)
+
+    async def _prewarm_connections(self, nvidia_config: NVIDIAConfig):
+        """HEAD each upstream host so DNS and TLS are done before Stage 1"""
+        # A plain session on the shared connector: the sockets stay pooled for
+        # both clients, the NVIDIA API key stays off the public hosts, and the
+        # HEADs can't be answered by the biotech session's response cache
+        urls = [
+            BiotechAgent.UNIPROT_API,
+            BiotechAgent.CHEMBL_API,
+            BiotechAgent.PUBMED_API,
+            nvidia_config.biology_url,
+            nvidia_config.llm_url,
+        ]
+
+        async def head(url: str):
+            async with session.head(url, allow_redirects=False, timeout=_PREWARM_TIMEOUT) as resp:
+                await resp.release()
+
+        async with aiohttp.ClientSession(connector=self._connector, connector_owner=False) as session:
+            await asyncio.gather(*(head(url) for url in urls), return_exceptions=True)
 
     async def run_full_pipeline(
         self,
@@ -124,119 +265,194 @@ class DrugDiscoveryPipeline:
         Returns:
             Comprehensive pipeline results
         """
+        return await self._run_pipeline(target_id, None, generate_ligands, num_ligands, render_images)
+
+    async def _run_pipeline(
+        self,
+        target_id: str,
+        target_data: Optional[Dict],
+        generate_ligands: bool = True,
+        num_ligands: int = 10,
+        render_images: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Run the pipeline stages, reusing Stage 1 data when it was prefetched"""
         # Use config setting if not explicitly specified
         if render_images is None:
             render_images = self.config.render_images
-        print("\n" + "=" * 70)
-        print("  DRUG DISCOVERY PIPELINE")
-        print("  NVIDIA BioNeMo + CroweLM Integration")
-        print("=" * 70 + "\n")
+        banner = "=" * 70
+        logger.info("\n%s\n  DRUG DISCOVERY PIPELINE\n  NVIDIA BioNeMo + CroweLM Integration\n%s\n", banner, banner)
 
+        started = datetime.now()
         results = {
             "target_id": target_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": started.isoformat(),
             "stages": {},
         }
 
         # Stage 1: Target Analysis
-        print("[STAGE 1] TARGET ANALYSIS")
-        print("-" * 70)
+        logger.info("[STAGE 1] TARGET ANALYSIS\n%s", _STAGE_RULE)
 
-        target_data = await self._analyze_target(target_id)
+        if target_data is None:
+            target_data = await self._analyze_target(target_id)
         results["stages"]["target_analysis"] = target_data
-        print(f"  [OK] Gene: {target_data.get('uniprot', {}).get('gene', 'Unknown')}")
-        print(f"  [OK] Protein: {target_data.get('uniprot', {}).get('protein_name', 'Unknown')[:50]}")
+        logger.info("  [OK] Gene: %s", target_data.get("uniprot", {}).get("gene", "Unknown"))
+        logger.info("  [OK] Protein: %.50s", target_data.get("uniprot", {}).get("protein_name", "Unknown"))
 
-        # Stage 2: Structure Prediction
+        # Stages 2-4 are independent NIM calls once the target is known, so they
+        # are started together and their results collected in stage order
         sequence = target_data.get("uniprot", {}).get("sequence")
-        if sequence and len(sequence) <= 400:
-            print("\n[STAGE 2] STRUCTURE PREDICTION (NVIDIA ESMFold)")
-            print("-" * 70)
-
-            structure = await self.nvidia_nims.predict_structure_esmfold(sequence)
-            results["stages"]["structure_prediction"] = {
-                "method": "ESMFold (NVIDIA NIM)",
-                "success": "error" not in structure,
-                "pdb_generated": bool(structure.get("pdbs")),
-            }
-            if structure.get("pdbs"):
-                pdb_path = self._save_pdb(target_id, structure["pdbs"][0])
-                results["stages"]["structure_prediction"]["pdb_file"] = pdb_path
-                print(f"  [OK] Structure saved: {pdb_path}")
-        else:
-            print("\n  [SKIP] Structure prediction (sequence too long or unavailable)")
-            results["stages"]["structure_prediction"] = {"skipped": True}
+        gene_name = target_data.get("uniprot", {}).get("gene", target_id)
 
-        # Stage 3: Molecule Generation
+        structure_task = None
+        if sequence and len(sequence) <= 400:
+            structure_task = asyncio.create_task(self._predict_structure(target_id, sequence))
+        ligands_task = None
         if generate_ligands:
-            print("\n[STAGE 3] LIGAND GENERATION (NVIDIA MolMIM)")
-            print("-" * 70)
-
-            ligands = await self.nvidia_nims.generate_molecules(
-                num_molecules=num_ligands,
-                algorithm="CMA-ES",
-                property_name="QED",
-                smi="CC(=O)Oc1ccccc1C(=O)O",
-                iterations=10,
-                particles=30
-            )
-            results["stages"]["ligand_generation"] = {
-                "method": "MolMIM (NVIDIA NIM)",
-                "seed": "Aspirin (CC(=O)Oc1ccccc1C(=O)O)",
-                "molecules": ligands.get("molecules", []),
-                "property_optimized": "QED"
-            }
-            print(f"  [OK] Generated {len(ligands.get('molecules', []))} novel molecules")
-
-        # Stage 4: AI Analysis
-        print("\n[STAGE 4] AI DRUGGABILITY ANALYSIS")
-        print("-" * 70)
-
-        gene_name = target_data.get("uniprot", {}).get("gene", target_id)
-        science_context = await self.nvidia_nims.science_chat(
+            ligands_task = asyncio.create_task(self._generate_ligands(num_ligands))
+        chat_task = asyncio.create_task(self.nvidia_nims.science_chat(
             f"Provide a brief druggability assessment for {gene_name}. "
             f"Include: target class, known modulators, development considerations."
-        )
-        results["stages"]["ai_analysis"] = {
-            "nvidia_assessment": science_context,
-        }
-        print(f"  [OK] NVIDIA Nemotron analysis complete")
+        ))
+
+        # If one stage fails, the others are cancelled instead of left running
+        stage_tasks = [t for t in (structure_task, ligands_task, chat_task) if t]
+        try:
+            # Stage 2: Structure Prediction
+            if structure_task:
+                logger.info("\n[STAGE 2] STRUCTURE PREDICTION (NVIDIA ESMFold)\n%s", _STAGE_RULE)
+
+                structure_stage = await structure_task
+                results["stages"]["structure_prediction"] = structure_stage
+                if "pdb_file" in structure_stage:
+                    logger.info("  [OK] Structure saved: %s", structure_stage["pdb_file"])
+            else:
+                logger.info("\n  [SKIP] Structure prediction (sequence too long or unavailable)")
+                results["stages"]["structure_prediction"] = {"skipped": True}
+
+            # Stage 3: Molecule Generation
+            if ligands_task:
+                logger.info("\n[STAGE 3] LIGAND GENERATION (NVIDIA MolMIM)\n%s", _STAGE_RULE)
+
+                ligands = await ligands_task
+                ligand_stage = results["stages"]["ligand_generation"] = {
+                    "method": "MolMIM (NVIDIA NIM)",
+                    "seed": "Aspirin (CC(=O)Oc1ccccc1C(=O)O)",
+                    "molecules": ligands.get("molecules", []),
+                    "property_optimized": "QED"
+                }
+                if "error" in ligands:
+                    ligand_stage["error"] = ligands["error"]
+                    logger.info("  [FAIL] Ligand generation: %s", ligands["error"])
+                else:
+                    logger.info("  [OK] Generated %d novel molecules", len(ligand_stage["molecules"]))
+
+            # Stage 4: AI Analysis
+            logger.info("\n[STAGE 4] AI DRUGGABILITY ANALYSIS\n%s", _STAGE_RULE)
+
+            science_context = await chat_task
+            results["stages"]["ai_analysis"] = {
+                "nvidia_assessment": science_context,
+            }
+            logger.info("  [OK] NVIDIA Nemotron analysis complete")
+        except BaseException:
+            for task in stage_tasks:
+                task.cancel()
+            raise
 
         # Stage 5: Generate Report
-        print("\n[STAGE 5] REPORT GENERATION")
-        print("-" * 70)
+        logger.info("\n[STAGE 5] REPORT GENERATION\n%s", _STAGE_RULE)
 
         report = self._generate_report(results)
         results["report"] = report
 
-        output_path = self._save_results(target_id, results)
-        print(f"  [OK] Full report saved: {output_path}")
+        output_path = await self._save_results(target_id, results, started)
+        logger.info("  [OK] Full report saved: %s", output_path)
 
         # Stage 6: Generate Visualizations (optional)
         if render_images:
-            print("\n[STAGE 6] VISUALIZATION GENERATION")
-            print("-" * 70)
+            logger.info("\n[STAGE 6] VISUALIZATION GENERATION\n%s", _STAGE_RULE)
 
             if not VIZ_AVAILABLE:
-                print(f"  [SKIP] Visualization dependencies not installed")
-                print(f"  {get_installation_instructions()}")
+                logger.info("  [SKIP] Visualization dependencies not installed\n  %s", get_installation_instructions())
                 results["stages"]["visualization"] = {"skipped": True, "reason": "dependencies_missing"}
             else:
                 viz_results = await self._generate_visualizations(target_id, results)
                 results["stages"]["visualization"] = viz_results
                 if viz_results.get("files"):
-                    print(f"  [OK] Generated {len(viz_results['files'])} visualization files")
+                    logger.info("  [OK] Generated %d visualization files", len(viz_results["files"]))
                     for file_type, file_path in viz_results["files"].items():
-                        print(f"       - {file_type}: {file_path}")
+                        logger.info("       - %s: %s", file_type, file_path)
         else:
             results["stages"]["visualization"] = {"skipped": True, "reason": "not_requested"}
 
-        print("\n" + "=" * 70)
-        print("  PIPELINE COMPLETE")
-        print("=" * 70 + "\n")
+        logger.info("\n%s\n  PIPELINE COMPLETE\n%s\n", banner, banner)
 
         return results
 
+    async def run_batch_pipeline(
+        self, target_ids: List[str], **kwargs
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Run the full pipeline for several targets.
+
+        UniProt entries are fetched up front so the PubMed literature for every
+        target comes from one batched search. Stage 1 lookups are then
+        prefetched in order while up to ``max_concurrent_targets`` targets run
+        their NIM stages at once.
+
+        Args:
+            target_ids: UniProt accession IDs
+            **kwargs: Passed through to run_full_pipeline
+
+        Returns:
+            Pipeline results, one per target in input order; a target that
+            failed has its exception in place of results
+        """
+        entries = await asyncio.gather(*(
+            self.biotech_agent.fetch_uniprot(target_id, include_sequence=True)
+            for target_id in target_ids
+        ))
+        queries = [
+            f"{entry.get('gene', target_id)} drug target"
+            for target_id, entry in zip(target_ids, entries)
+        ]
+        self._literature.update(
+            await self.biotech_agent.search_pubmed_batch(queries, max_results=5)
+        )
+
+        workers = max(1, min(self.config.max_concurrent_targets, len(target_ids)))
+        # Bounded so prefetching stays just ahead of the workers
+        prefetched: asyncio.Queue = asyncio.Queue(maxsize=workers + 1)
+        batch: List[Union[Dict[str, Any], Exception, None]] = [None] * len(target_ids)
+
+        async def prefetch():
+            for index, target_id in enumerate(target_ids):
+                try:
+                    target_data = await self._analyze_target(target_id)
+                except Exception as e:
+                    target_data = e
+                await prefetched.put((index, target_id, target_data))
+            for _ in range(workers):
+                await prefetched.put(None)
+
+        async def work():
+            while (item := await prefetched.get()) is not None:
+                index, target_id, target_data = item
+                if isinstance(target_data, Exception):
+                    batch[index] = target_data
+                    continue
+                try:
+                    batch[index] = await self._run_pipeline(target_id, target_data, **kwargs)
+                except Exception as e:
+                    batch[index] = e
+
+        prefetch_task = asyncio.create_task(prefetch())
+        try:
+            await asyncio.gather(*(work() for _ in range(workers)))
+        finally:
+            prefetch_task.cancel()
+        return batch
+
     async def _generate_visualizations(
         self,
         target_id: str,
@@ -258,224 +474,282 @@ class DrugDiscoveryPipeline:
             "errors": [],
         }
 
-        output_dir = Path(self.config.output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-
         stages = results.get("stages", {})
-
-        # 1. Generate 3D structure viewer (if PDB was generated)
-        if PY3DMOL_AVAILABLE and StructureVisualizer:
-            struct_data = stages.get("structure_prediction", {})
-            pdb_file = struct_data.get("pdb_file")
-
-            if pdb_file and Path(pdb_file).exists():
-                try:
-                    viz = StructureVisualizer()
-                    html_path = output_dir / f"{target_id}_structure_viewer.html"
-                    saved_path = viz.save_html_from_file(
-                        pdb_file,
-                        html_path,
-                        style="cartoon",
-                        title=f"Structure: {target_id}",
-                    )
-                    viz_results["files"]["structure_viewer"] = saved_path
-                except Exception as e:
-                    viz_results["errors"].append(f"Structure viewer: {e}")
-
-        # 2. Generate molecule grid image (if ligands were generated)
-        if RDKIT_AVAILABLE and MoleculeVisualizer:
-            ligand_data = stages.get("ligand_generation", {})
-            molecules = ligand_data.get("molecules", [])
-
-            if molecules:
-                try:
-                    viz = MoleculeVisualizer()
-
-                    # Top 5 molecules grid
-                    sorted_mols = sorted(
-                        molecules, key=lambda x: x.get("score", 0), reverse=True
-                    )[:5]
-                    smiles_list = [mol.get("sample", "") for mol in sorted_mols]
-                    legends = [
-                        f"#{i+1} (QED: {mol.get('score', 0):.3f})"
-                        for i, mol in enumerate(sorted_mols)
-                    ]
-
-                    top5_path = output_dir / f"{target_id}_top5_molecules.png"
-                    viz.save_grid_png(
-                        smiles_list,
-                        top5_path,
-                        legends=legends,
-                        cols=min(5, len(smiles_list)),
-                        mol_size=(250, 250),
-                    )
-                    viz_results["files"]["top5_molecules"] = str(top5_path)
-
-                    # Full molecule grid
-                    all_smiles = [mol.get("sample", "") for mol in molecules[:20]]
-                    all_legends = [
-                        f"QED: {mol.get('score', 0):.2f}"
-                        for mol in molecules[:20]
-                    ]
-                    grid_path = output_dir / f"{target_id}_molecules_grid.png"
-                    viz.save_grid_png(
-                        all_smiles,
-                        grid_path,
-                        legends=all_legends,
-                        cols=4,
-                        mol_size=(200, 200),
-                    )
-                    viz_results["files"]["molecules_grid"] = str(grid_path)
-
-                except Exception as e:
-                    viz_results["errors"].append(f"Molecule images: {e}")
-
-        # 3. Generate property charts (if matplotlib available)
-        if MATPLOTLIB_AVAILABLE and ChartGenerator:
-            ligand_data = stages.get("ligand_generation", {})
-            molecules = ligand_data.get("molecules", [])
-
-            if molecules:
-                try:
-                    chart_gen = ChartGenerator()
-
-                    # QED distribution histogram
-                    qed_bytes = chart_gen.qed_distribution(molecules)
-                    qed_path = output_dir / f"{target_id}_qed_distribution.png"
-                    chart_gen.save_png(qed_bytes, qed_path)
-                    viz_results["files"]["qed_distribution"] = str(qed_path)
-
-                    # Pipeline summary chart
-                    summary_bytes = chart_gen.pipeline_summary(results)
-                    summary_path = output_dir / f"{target_id}_pipeline_summary.png"
-                    chart_gen.save_png(summary_bytes, summary_path)
-                    viz_results["files"]["pipeline_summary"] = str(summary_path)
-
-                except Exception as e:
-                    viz_results["errors"].append(f"Charts: {e}")
+        pdb_file = stages.get("structure_prediction", {}).get("pdb_file")
+        molecules = stages.get("ligand_generation", {}).get("molecules", [])
+
+        renders = {}
+        # 1. 3D structure viewer (if PDB was generated)
+        if PY3DMOL_AVAILABLE and StructureVisualizer and pdb_file and Path(pdb_file).exists():
+            renders["Structure viewer"] = (self._render_structure_viewer, target_id, pdb_file)
+        # 2. Molecule grid images (if ligands were generated)
+        if RDKIT_AVAILABLE and MoleculeVisualizer and molecules:
+            renders["Molecule images"] = (self._render_molecule_images, target_id, molecules)
+        # 3. Property charts (if matplotlib available)
+        if MATPLOTLIB_AVAILABLE and ChartGenerator and molecules:
+            renders["Charts"] = (self._render_charts, target_id, molecules, results)
+
+        # The renderers block in py3Dmol/RDKit/matplotlib, so each runs in its own
+        # worker thread; each fills its own dict so file order stays deterministic
+        files = {label: {} for label in renders}
+        outcomes = await asyncio.gather(
+            *(asyncio.to_thread(fn, *args, files[label]) for label, (fn, *args) in renders.items()),
+            return_exceptions=True,
+        )
+        for label, outcome in zip(renders, outcomes):
+            viz_results["files"].update(files[label])
+            if isinstance(outcome, Exception):
+                viz_results["errors"].append(f"{label}: {outcome}")
 
         if viz_results["errors"]:
             viz_results["success"] = False
 
         return viz_results
 
+    def _render_structure_viewer(self, target_id: str, pdb_file: str, files: Dict[str, str]):
+        """Write the interactive 3D structure viewer"""
+        viz = StructureVisualizer()
+        html_path = self._out / f"{target_id}_structure_viewer.html"
+        files["structure_viewer"] = viz.save_html_from_file(
+            pdb_file,
+            html_path,
+            style="cartoon",
+            title=f"Structure: {target_id}",
+        )
+
+    def _render_molecule_images(self, target_id: str, molecules: List[Dict], files: Dict[str, str]):
+        """Write the top-5 and full molecule grid images"""
+        viz = MoleculeVisualizer()
+
+        # Top 5 molecules grid
+        sorted_mols = heapq.nlargest(5, molecules, key=lambda x: x.get("score", 0))
+        smiles_list, legends = map(list, zip(*(
+            (mol.get("sample", ""), f"#{i} (QED: {mol.get('score', 0):.3f})")
+            for i, mol in enumerate(sorted_mols, 1)
+        )))
+
+        top5_path = self._out / f"{target_id}_top5_molecules.png"
+        viz.save_grid_png(
+            smiles_list,
+            top5_path,
+            legends=legends,
+            cols=min(5, len(smiles_list)),
+            mol_size=(250, 250),
+        )
+        files["top5_molecules"] = str(top5_path)
+
+        # Full molecule grid
+        all_smiles, all_legends = map(list, zip(*(
+            (mol.get("sample", ""), f"QED: {mol.get('score', 0):.2f}")
+            for mol in molecules[:20]
+        )))
+        grid_path = self._out / f"{target_id}_molecules_grid.png"
+        viz.save_grid_png(
+            all_smiles,
+            grid_path,
+            legends=all_legends,
+            cols=4,
+            mol_size=(200, 200),
+        )
+        files["molecules_grid"] = str(grid_path)
+
+    def _render_charts(
+        self, target_id: str, molecules: List[Dict], results: Dict, files: Dict[str, str]
+    ):
+        """Write the property charts; holds _CHART_LOCK since pyplot is not thread-safe"""
+        with _CHART_LOCK:
+            chart_gen = ChartGenerator()
+            qed_bytes = chart_gen.qed_distribution(molecules)
+            summary_bytes = chart_gen.pipeline_summary(results)
+
+        # QED distribution histogram
+        qed_path = self._out / f"{target_id}_qed_distribution.png"
+        chart_gen.save_png(qed_bytes, qed_path)
+        files["qed_distribution"] = str(qed_path)
+
+        # Pipeline summary chart
+        summary_path = self._out / f"{target_id}_pipeline_summary.png"
+        chart_gen.save_png(summary_bytes, summary_path)
+        files["pipeline_summary"] = str(summary_path)
+
     async def _analyze_target(self, target_id: str) -> Dict:
         """Analyze target using biotech agent"""
         data = {}
 
-        data["uniprot"] = await self.biotech_agent.fetch_uniprot(target_id)
-
-        if data["uniprot"].get("sequence_length"):
-            session = await self.biotech_agent._ensure_session()
-            try:
-                async with session.get(
-                    f"https://rest.uniprot.org/uniprotkb/{target_id}.fasta"
-                ) as resp:
-                    if resp.status == 200:
-                        fasta = await resp.text()
-                        lines = fasta.strip().split('\n')
-                        sequence = ''.join(lines[1:])
-                        data["uniprot"]["sequence"] = sequence
-            except:
-                pass
-
-        data["chembl"] = await self.biotech_agent.fetch_chembl_target(target_id)
+        # ChEMBL only needs the accession, so it overlaps with the UniProt lookup;
+        # the UniProt entry carries the sequence, so no separate FASTA request
+        data["uniprot"], data["chembl"] = await asyncio.gather(
+            self.biotech_agent.fetch_uniprot(target_id, include_sequence=True),
+            self.biotech_agent.fetch_chembl_target(target_id),
+        )
 
         gene = data["uniprot"].get("gene", target_id)
-        data["literature"] = await self.biotech_agent.search_pubmed(
-            f"{gene} drug target", max_results=5
-        )
+        query = f"{gene} drug target"
+        data["literature"] = self._literature.pop(query, None)
+        if data["literature"] is None:
+            data["literature"] = await self.biotech_agent.search_pubmed(query, max_results=5)
 
         return data
 
-    def _save_pdb(self, target_id: str, pdb_content: str) -> str:
+    async def _predict_structure(self, target_id: str, sequence: str) -> Dict:
+        """Run ESMFold and save the PDB; only the file path is kept in the stage record"""
+        async with self._esmfold_sem:
+            structure = await self.nvidia_nims.predict_structure_esmfold(sequence)
+        pdbs = structure.pop("pdbs", None)
+        stage = {
+            "method": "ESMFold (NVIDIA NIM)",
+            "success": "error" not in structure,
+            "pdb_generated": bool(pdbs),
+        }
+        if pdbs:
+            stage["pdb_file"] = await self._save_pdb(target_id, pdbs[0])
+        return stage
+
+    async def _generate_ligands(self, num_ligands: int) -> Dict:
+        """Split ligand generation across parallel MolMIM runs, merged and deduplicated by canonical SMILES"""
+        async def generate(num_molecules: int) -> Dict:
+            # Runs share one payload; MolMIM's CMA-ES sampling is stochastic and
+            # repeats are dropped by the dedup and topped up in the next round
+            async with self._molmim_sem:
+                return await self.nvidia_nims.generate_molecules(
+                    num_molecules=num_molecules,
+                    algorithm="CMA-ES",
+                    property_name="QED",
+                    smi="CC(=O)Oc1ccccc1C(=O)O",
+                    iterations=10,
+                    particles=30,
+                )
+
+        unique = {}
+        errors = []
+        succeeded = False
+        total_runs = 0
+        # Duplicates across runs are topped up with further runs
+        for _ in range(self.LIGAND_ROUNDS):
+            missing = num_ligands - len(unique)
+            if missing <= 0:
+                break
+            runs = max(1, min(self.config.ligand_parallelism, missing))
+            per_run, extra = divmod(missing, runs)
+            responses = await asyncio.gather(
+                *(generate(per_run + (i < extra)) for i in range(runs)),
+                return_exceptions=True,
+            )
+            total_runs += runs
+
+            generated = []
+            for response in responses:
+                if isinstance(response, BaseException):
+                    errors.append(str(response) or type(response).__name__)
+                elif "error" in response:
+                    errors.append(str(response["error"]))
+                else:
+                    succeeded = True
+                    generated.extend(response.get("molecules", []))
+            if not generated:
+                break
+
+            keys = await self._canonicalize(
+                [mol.get("sample") if isinstance(mol, dict) else mol for mol in generated]
+            )
+            for key, mol in zip(keys, generated):
+                unique.setdefault(key, mol)
+
+        if not succeeded:
+            return {"error": f"All {total_runs} MolMIM runs failed: {errors[0]}"}
+
+        molecules = list(unique.values())
+        if all(isinstance(m, dict) for m in molecules):
+            molecules.sort(key=lambda m: m.get("score") or 0, reverse=True)
+        return {"molecules": molecules[:num_ligands]}
+
+    async def _canonicalize(self, smiles: List[str]) -> List[str]:
+        """Canonical SMILES for dedup; large sets are parsed in worker processes"""
+        if Chem is None or len(smiles) < self.CANONICALIZE_POOL_MIN:
+            return _canonical_smiles_batch(smiles)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor()
+        workers = os.cpu_count() or 1
+        size = -(-len(smiles) // workers)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(self._pool, _canonical_smiles_batch, smiles[i:i + size])
+            for i in range(0, len(smiles), size)
+        ))
+        return [key for chunk in chunks for key in chunk]
+
+    async def _save_pdb(self, target_id: str, pdb_content: str) -> str:
         """Save PDB structure to file"""
-        os.makedirs(self.config.output_dir, exist_ok=True)
-        pdb_path = os.path.join(self.config.output_dir, f"{target_id}_predicted.pdb")
-        with open(pdb_path, 'w') as f:
-            f.write(pdb_content)
-        return pdb_path
+        pdb_path = self._out / f"{target_id}_predicted.pdb"
+        # Written off the event loop so concurrent NIM stages keep progressing
+        await asyncio.to_thread(pdb_path.write_text, pdb_content)
+        return str(pdb_path)
 
     def _generate_report(self, results: Dict) -> str:
         """Generate summary report"""
-        target = results.get("target_id", "Unknown")
         stages = results.get("stages", {})
-
-        report_lines = [
-            f"# Drug Discovery Report: {target}",
-            f"Generated: {results.get('timestamp', 'N/A')}",
-            "",
-            "## Target Information",
-        ]
-
         uniprot = stages.get("target_analysis", {}).get("uniprot", {})
-        report_lines.extend([
-            f"- **Gene**: {uniprot.get('gene', 'N/A')}",
-            f"- **Protein**: {uniprot.get('protein_name', 'N/A')}",
-            f"- **Organism**: {uniprot.get('organism', 'N/A')}",
-            f"- **Length**: {uniprot.get('sequence_length', 'N/A')} residues",
-            "",
-        ])
+
+        sections = [_REPORT_HEADER.format_map({
+            "target": results.get("target_id", "Unknown"),
+            "timestamp": results.get("timestamp", "N/A"),
+            "gene": uniprot.get("gene", "N/A"),
+            "protein": uniprot.get("protein_name", "N/A"),
+            "organism": uniprot.get("organism", "N/A"),
+            "length": uniprot.get("sequence_length", "N/A"),
+        })]
 
         struct = stages.get("structure_prediction", {})
         if struct.get("pdb_generated"):
-            report_lines.extend([
-                "## Structure Prediction",
-                f"- **Method**: ESMFold (NVIDIA NIM)",
-                f"- **PDB File**: {struct.get('pdb_file', 'N/A')}",
-                "",
-            ])
+            sections.append(_REPORT_STRUCTURE.format_map({
+                "pdb_file": struct.get("pdb_file", "N/A"),
+            }))
 
         ligands = stages.get("ligand_generation", {})
         if ligands.get("molecules"):
-            report_lines.extend([
-                "## Generated Ligands",
-                f"- **Method**: MolMIM (NVIDIA NIM)",
-                f"- **Seed**: {ligands.get('seed', 'N/A')}",
-                f"- **Property Optimized**: {ligands.get('property_optimized', 'QED')}",
-                "",
-                "| Rank | SMILES | QED Score |",
-                "|------|--------|-----------|",
-            ])
-            for i, mol in enumerate(ligands["molecules"][:10], 1):
-                smiles = mol.get("sample", "N/A")[:40]
-                score = mol.get("score", 0)
-                report_lines.append(f"| {i} | {smiles} | {score:.3f} |")
-            report_lines.append("")
+            sections.append(_REPORT_LIGANDS.format_map({
+                "seed": ligands.get("seed", "N/A"),
+                "property": ligands.get("property_optimized", "QED"),
+                "rows": "\n".join(
+                    f"| {i} | {mol.get('sample', 'N/A')[:40]} | {mol.get('score', 0):.3f} |"
+                    for i, mol in enumerate(ligands["molecules"][:10], 1)
+                ),
+            }))
 
         ai = stages.get("ai_analysis", {})
         if ai.get("nvidia_assessment"):
-            report_lines.extend([
-                "## AI Druggability Assessment",
-                "",
-                ai["nvidia_assessment"][:2000],
-                "",
-            ])
+            sections.append(_REPORT_ASSESSMENT.format_map({
+                "assessment": ai["nvidia_assessment"][:2000],
+            }))
 
         # Add visualization section if images were generated
         viz = stages.get("visualization", {})
         if viz.get("files"):
-            report_lines.extend([
-                "## Visualizations",
-                "",
-            ])
-            for viz_type, file_path in viz["files"].items():
-                viz_name = viz_type.replace("_", " ").title()
-                report_lines.append(f"- **{viz_name}**: [{file_path}]({file_path})")
-            report_lines.append("")
-
-        return "\n".join(report_lines)
-
-    def _save_results(self, target_id: str, results: Dict) -> str:
-        """Save full results to JSON"""
-        os.makedirs(self.config.output_dir, exist_ok=True)
-        output_path = os.path.join(
-            self.config.output_dir,
-            f"{target_id}_pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            sections.append(_REPORT_VISUALIZATIONS.format_map({
+                "links": "\n".join(
+                    f"- **{viz_type.replace('_', ' ').title()}**: [{file_path}]({file_path})"
+                    for viz_type, file_path in viz["files"].items()
+                ),
+            }))
+
+        return "\n".join(sections)
+
+    async def _save_results(self, target_id: str, results: Dict, started: datetime) -> str:
+        """Save full results to JSON (gzipped unless compress_results is off)"""
+        # Named by run start, so the file matches the report's timestamp
+        output_path = self._out / f"{target_id}_pipeline_{started:%Y%m%d_%H%M%S}.json"
+        payload = orjson.dumps(
+            results,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
         )
-        with open(output_path, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
-        return output_path
+        if self.config.compress_results:
+            output_path = output_path.with_suffix(".json.gz")
+            # Level 1 already shrinks indented JSON several-fold at near write speed
+            payload = await asyncio.to_thread(gzip.compress, payload, compresslevel=1)
+        await asyncio.to_thread(output_path.write_bytes, payload)
+        return str(output_path)
 
 
 async def run_sequence_pipeline(sequence: str, generate_ligands: bool = True):
@@ -519,6 +793,7 @@ async def _main_async():
         epilog="""
 Examples:
   crowelm-pipeline --target P15056                    # Run pipeline for BRAF kinase
+  crowelm-pipeline --target P15056 P00533             # Several targets, batched lookups
   crowelm-pipeline --target P15056 --render           # Include visualizations
   crowelm-pipeline --sequence "MVLSPAD..." --render   # From protein sequence
 
@@ -527,7 +802,8 @@ Visualization Dependencies:
   # Installs: rdkit, py3Dmol, matplotlib, Pillow
         """
     )
-    parser.add_argument("--target", help="UniProt accession ID (e.g., P15056)")
+    parser.add_argument("--target", nargs="+",
+                        help="UniProt accession ID(s) (e.g., P15056)")
     parser.add_argument("--sequence", help="Protein sequence (amino acids)")
     parser.add_argument("--generate-ligands", action="store_true", default=True,
                         help="Generate novel ligands with MolMIM (default: True)")
@@ -541,26 +817,45 @@ Visualization Dependencies:
                         help="Generate visualization images (requires viz dependencies)")
     parser.add_argument("--no-render", action="store_true",
                         help="Skip visualization generation (default)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always refetch UniProt/ChEMBL/PubMed data")
+    parser.add_argument("--no-compress", action="store_true",
+                        help="Write results as plain JSON instead of .json.gz")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Targets to run at once with several --target IDs (default: 4)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Only print the final report, not stage progress")
 
     args = parser.parse_args()
+    configure_logging("WARNING" if args.quiet else "INFO")
 
     # Determine if we should generate ligands and render images
     generate_ligands = args.generate_ligands and not args.no_ligands
     render_images = args.render and not args.no_render
 
-    config = PipelineConfig(output_dir=args.output, render_images=render_images)
+    config = PipelineConfig(
+        output_dir=args.output,
+        render_images=render_images,
+        http_cache=not args.no_cache,
+        compress_results=not args.no_compress,
+        max_concurrent_targets=args.concurrency,
+    )
 
     if args.sequence:
         await run_sequence_pipeline(args.sequence, generate_ligands)
     elif args.target:
         async with DrugDiscoveryPipeline(config) as pipeline:
-            results = await pipeline.run_full_pipeline(
-                target_id=args.target,
+            batch = await pipeline.run_batch_pipeline(
+                args.target,
                 generate_ligands=generate_ligands,
                 num_ligands=args.num_ligands,
                 render_images=render_images,
             )
-            print("\n" + results.get("report", "No report generated"))
+            for target_id, results in zip(args.target, batch):
+                if isinstance(results, Exception):
+                    print(f"\nError: {target_id} failed: {results}")
+                else:
+                    print("\n" + results.get("report", "No report generated"))
     else:
         print("Running demo with BRAF kinase (P15056)...")
         async with DrugDiscoveryPipeline(config) as pipeline:
@@ -574,7 +869,7 @@ Visualization Dependencies:
 
 def main():
     """Sync entry point for crowelm-pipeline command."""
-    asyncio.run(_main_async())
+    run_async(_main_async())
 
 
 def visualize_command():
@@ -604,7 +899,7 @@ Available styles for --style:
     )
     parser.add_argument("--smiles", help="SMILES string for 2D molecule image")
     parser.add_argument("--pdb", help="PDB file path for 3D structure viewer")
-    parser.add_argument("--results", help="Pipeline results JSON file")
+    parser.add_argument("--results", help="Pipeline results JSON file (.json or .json.gz)")
     parser.add_argument("--output", "-o", required=True,
                         help="Output file path or directory")
     parser.add_argument("--style", default="cartoon",
@@ -677,8 +972,10 @@ Available styles for --style:
             print(f"Error: Results file not found: {results_path}")
             sys.exit(1)
 
-        with open(results_path) as f:
-            results = json.load(f)
+        raw = results_path.read_bytes()
+        if results_path.suffix == ".gz":
+            raw = gzip.decompress(raw)
+        results = orjson.loads(raw)
 
         output_dir = output_path if output_path.is_dir() or not output_path.suffix else output_path.parent
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -694,30 +991,41 @@ Available styles for --style:
         struct = stages.get("structure_prediction", {})
         pdb_file = struct.get("pdb_file")
 
-        if pdb_file and Path(pdb_file).exists() and PY3DMOL_AVAILABLE:
+        ligands = stages.get("ligand_generation", {}).get("molecules", [])
+
+        def render_structure():
             viz = StructureVisualizer()
             html_path = output_dir / f"{target_id}_structure_viewer.html"
-            saved_path = viz.save_html_from_file(pdb_file, html_path, style=args.style)
-            print(f"  Created: {saved_path}")
-
-        if RDKIT_AVAILABLE:
-            ligands = stages.get("ligand_generation", {}).get("molecules", [])
-            if ligands:
-                viz = MoleculeVisualizer()
-                smiles_list = [mol.get("sample", "") for mol in ligands[:10]]
-                legends = [f"QED: {mol.get('score', 0):.2f}" for mol in ligands[:10]]
-                grid_path = output_dir / f"{target_id}_molecules_grid.png"
-                viz.save_grid_png(smiles_list, grid_path, legends=legends, cols=5)
-                print(f"  Created: {grid_path}")
-
-        if MATPLOTLIB_AVAILABLE:
-            ligands = stages.get("ligand_generation", {}).get("molecules", [])
-            if ligands:
+            return viz.save_html_from_file(pdb_file, html_path, style=args.style)
+
+        def render_grid():
+            viz = MoleculeVisualizer()
+            smiles_list = [mol.get("sample", "") for mol in ligands[:10]]
+            legends = [f"QED: {mol.get('score', 0):.2f}" for mol in ligands[:10]]
+            grid_path = output_dir / f"{target_id}_molecules_grid.png"
+            viz.save_grid_png(smiles_list, grid_path, legends=legends, cols=5)
+            return grid_path
+
+        def render_qed_chart():
+            with _CHART_LOCK:
                 chart_gen = ChartGenerator()
                 qed_bytes = chart_gen.qed_distribution(ligands)
-                qed_path = output_dir / f"{target_id}_qed_distribution.png"
-                chart_gen.save_png(qed_bytes, qed_path)
-                print(f"  Created: {qed_path}")
+            qed_path = output_dir / f"{target_id}_qed_distribution.png"
+            chart_gen.save_png(qed_bytes, qed_path)
+            return qed_path
+
+        jobs = []
+        if pdb_file and Path(pdb_file).exists() and PY3DMOL_AVAILABLE:
+            jobs.append(render_structure)
+        if RDKIT_AVAILABLE and ligands:
+            jobs.append(render_grid)
+        if MATPLOTLIB_AVAILABLE and ligands:
+            jobs.append(render_qed_chart)
+
+        # The renderers are independent, so they run side by side
+        with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as pool:
+            for saved_path in pool.map(lambda job: job(), jobs):
+                print(f"  Created: {saved_path}")
 
         print(f"Done! Visualizations saved to: {output_dir}")
 
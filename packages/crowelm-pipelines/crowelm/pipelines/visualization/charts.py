@@ -10,16 +10,78 @@ Provides scientific data visualization using Matplotlib:
 Requires: matplotlib>=3.7.0, Pillow>=10.0.0
 """
 
+import functools
+import hashlib
+import heapq
 import io
+import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 from matplotlib.figure import Figure
 
 
+def _extract(molecules: List[Dict], key: str, default: Optional[float] = None) -> np.ndarray:
+    """
+    Collect one property across molecules into a float array.
+
+    Molecules without the property are skipped, or filled with ``default``
+    when one is given.
+    """
+    if default is None:
+        return np.fromiter(
+            (value for mol in molecules if (value := mol.get(key)) is not None),
+            dtype=np.float64,
+        )
+    return np.fromiter(
+        (mol.get(key, default) for mol in molecules),
+        dtype=np.float64,
+        count=len(molecules),
+    )
+
+
+# Rendered chart bytes by content hash of (chart, settings, inputs), most recent last
+_RENDER_CACHE: "OrderedDict[bytes, bytes]" = OrderedDict()
+_RENDER_CACHE_SIZE = 64
+_RENDER_CACHE_LOCK = threading.Lock()
+
+
+def _cached_render(method: Callable[..., bytes]) -> Callable[..., bytes]:
+    """
+    Reuse the bytes of an identical earlier render.
+
+    Repeat runs over the same targets produce the same chart inputs, so
+    the image is looked up by a hash of the inputs instead of redrawn.
+    """
+    @functools.wraps(method)
+    def wrapper(self: "ChartGenerator", *args: Any, **kwargs: Any) -> bytes:
+        blob = json.dumps(
+            [method.__name__, self.figsize, self._effective_dpi, self._rc, args, kwargs],
+            sort_keys=True,
+            default=str,
+        )
+        key = hashlib.blake2b(blob.encode(), digest_size=16).digest()
+        with _RENDER_CACHE_LOCK:
+            if key in _RENDER_CACHE:
+                _RENDER_CACHE.move_to_end(key)
+                return _RENDER_CACHE[key]
+
+        chart = method(self, *args, **kwargs)
+        with _RENDER_CACHE_LOCK:
+            _RENDER_CACHE[key] = chart
+            if len(_RENDER_CACHE) > _RENDER_CACHE_SIZE:
+                _RENDER_CACHE.popitem(last=False)
+        return chart
+
+    return wrapper
+
+
 class ChartGenerator:
     """
     Generate scientific charts and visualizations using Matplotlib.
@@ -56,6 +118,7 @@ class ChartGenerator:
         figsize: Tuple[float, float] = (10, 6),
         dpi: int = 150,
         style: str = "seaborn-v0_8-whitegrid",
+        draft: bool = False,
     ):
         """
         Initialize the chart generator.
@@ -64,18 +127,55 @@ class ChartGenerator:
             figsize: Default figure size (width, height) in inches.
             dpi: Resolution for saved images.
             style: Matplotlib style to use.
+            draft: Render at half ``dpi`` (about a quarter of the pixels),
+                for previews and CI artifacts.
         """
         self.figsize = figsize
         self.dpi = dpi
         self.style = style
+        self.draft = draft
+        self._effective_dpi = max(1, dpi // 2) if draft else dpi
+        # Style resolved once; every chart then applies the same merged settings
+        self._rc = {**self._load_style(style), **self.STYLE_CONFIG}
+
+    @staticmethod
+    def _load_style(style: str) -> Dict[str, Any]:
+        """Resolve a style as ``plt.style.use`` would, falling back to seaborn whitegrid."""
+        if style in mpl.style.library:
+            return dict(mpl.style.library[style])
+        # "default", style files and URLs go through plt.style.use itself; the
+        # result is captured without touching the global rcParams
+        try:
+            with mpl.rc_context():
+                plt.style.use(style)
+                params = dict(plt.rcParams)
+        except OSError:
+            return dict(mpl.style.library["seaborn-v0_8-whitegrid"])
+        # Styles never select the backend; keep whatever is active at render time
+        params.pop("backend", None)
+        return params
 
     def _apply_style(self):
         """Apply consistent styling to charts."""
-        try:
-            plt.style.use(self.style)
-        except OSError:
-            plt.style.use("seaborn-v0_8-whitegrid")
-        plt.rcParams.update(self.STYLE_CONFIG)
+        plt.rcParams.update(self._rc)
+
+    def _histogram(self, ax, values: np.ndarray, bins: int, alpha: float):
+        """
+        Draw a histogram as a single bar call.
+
+        Same bars as ``ax.hist``, but binned with ``np.histogram`` up front
+        so the per-call hist argument handling is skipped.
+        """
+        counts, edges = np.histogram(values, bins=bins)
+        ax.bar(
+            edges[:-1],
+            counts,
+            width=np.diff(edges),
+            align="edge",
+            color=self.COLORS["primary"],
+            edgecolor="white",
+            alpha=alpha,
+        )
 
     def _fig_to_bytes(self, fig: Figure, format: str = "png") -> bytes:
         """
@@ -89,11 +189,12 @@ class ChartGenerator:
             Image bytes.
         """
         buf = io.BytesIO()
-        fig.savefig(buf, format=format, dpi=self.dpi, bbox_inches="tight")
+        fig.savefig(buf, format=format, dpi=self._effective_dpi, bbox_inches="tight")
         buf.seek(0)
         plt.close(fig)
         return buf.getvalue()
 
+    @_cached_render
     def qed_distribution(
         self,
         molecules: List[Dict],
@@ -115,24 +216,18 @@ class ChartGenerator:
         """
         self._apply_style()
 
-        scores = [mol.get(score_key, 0) for mol in molecules if mol.get(score_key) is not None]
+        scores = _extract(molecules, score_key)
 
-        if not scores:
+        if not scores.size:
             raise ValueError("No valid QED scores found in molecules")
 
         fig, ax = plt.subplots(figsize=self.figsize)
 
         # Create histogram
-        n, bins_edges, patches = ax.hist(
-            scores,
-            bins=bins,
-            color=self.COLORS["primary"],
-            edgecolor="white",
-            alpha=0.8,
-        )
+        self._histogram(ax, scores, bins, alpha=0.8)
 
         # Add statistics
-        mean_score = np.mean(scores)
+        mean_score = scores.mean()
         median_score = np.median(scores)
 
         ax.axvline(
@@ -166,7 +261,7 @@ class ChartGenerator:
         ax.set_xlim(0, 1)
 
         # Add statistics text box
-        stats_text = f"N = {len(scores)}\nMax: {max(scores):.3f}\nMin: {min(scores):.3f}"
+        stats_text = f"N = {scores.size}\nMax: {scores.max():.3f}\nMin: {scores.min():.3f}"
         ax.text(
             0.95,
             0.95,
@@ -180,6 +275,7 @@ class ChartGenerator:
 
         return self._fig_to_bytes(fig)
 
+    @_cached_render
     def property_radar(
         self,
         molecule: Dict,
@@ -215,22 +311,23 @@ class ChartGenerator:
         labels = list(default_properties.keys())
         num_vars = len(labels)
 
-        # Normalize values
-        values = []
-        ideal_values = []
-        for prop in default_properties.values():
-            normalized = min(prop["value"] / prop["max"], 1.0) if prop["max"] > 0 else 0
-            ideal_normalized = prop["ideal"] / prop["max"] if prop["max"] > 0 else 0
-            values.append(normalized)
-            ideal_values.append(ideal_normalized)
+        # Normalize values (properties without a positive max plot at 0)
+        props = default_properties.values()
+        raw = np.array([prop["value"] for prop in props], dtype=np.float64)
+        maxs = np.array([prop["max"] for prop in props], dtype=np.float64)
+        ideals = np.array([prop["ideal"] for prop in props], dtype=np.float64)
+        valid = maxs > 0
+        scale = np.where(valid, maxs, 1.0)
+        values = np.where(valid, np.minimum(raw / scale, 1.0), 0.0)
+        ideal_values = np.where(valid, ideals / scale, 0.0)
 
         # Close the radar chart
-        values += values[:1]
-        ideal_values += ideal_values[:1]
+        values = np.append(values, values[:1])
+        ideal_values = np.append(ideal_values, ideal_values[:1])
 
         # Calculate angles
-        angles = [n / float(num_vars) * 2 * np.pi for n in range(num_vars)]
-        angles += angles[:1]
+        angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False)
+        angles = np.append(angles, angles[:1])
 
         fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(polar=True))
 
@@ -254,6 +351,7 @@ class ChartGenerator:
 
         return self._fig_to_bytes(fig)
 
+    @_cached_render
     def scatter_plot(
         self,
         molecules: List[Dict],
@@ -283,14 +381,14 @@ class ChartGenerator:
         """
         self._apply_style()
 
-        x_values = [mol.get(x_prop, 0) for mol in molecules]
-        y_values = [mol.get(y_prop, 0) for mol in molecules]
+        x_values = _extract(molecules, x_prop, 0.0)
+        y_values = _extract(molecules, y_prop, 0.0)
 
         fig, ax = plt.subplots(figsize=self.figsize)
 
         # Color mapping
         if color_prop:
-            c_values = [mol.get(color_prop, 0) for mol in molecules]
+            c_values = _extract(molecules, color_prop, 0.0)
             scatter = ax.scatter(
                 x_values,
                 y_values,
@@ -331,32 +429,53 @@ class ChartGenerator:
         Returns:
             PNG image bytes.
         """
+        # Only the fields drawn below go into the render cache key; the full
+        # results carry per-run timestamps and would never repeat
+        stages = results.get("stages", {})
+        uniprot = stages.get("target_analysis", {}).get("uniprot", {})
+        ligands = stages.get("ligand_generation", {}).get("molecules", [])
+        summary = {
+            "target_id": results.get("target_id", "N/A"),
+            "stages": {name: self._stage_status(data) for name, data in stages.items()},
+            "uniprot": {
+                key: uniprot[key]
+                for key in ("gene", "protein_name", "organism", "sequence_length")
+                if key in uniprot
+            },
+            "pdb_generated": bool(stages.get("structure_prediction", {}).get("pdb_generated")),
+            "ligands": [
+                {key: mol[key] for key in ("sample", "score") if key in mol} for mol in ligands
+            ],
+        }
+        return self._render_pipeline_summary(summary, title)
+
+    @staticmethod
+    def _stage_status(stage_data: Any) -> str:
+        """Status label shown for one pipeline stage."""
+        if isinstance(stage_data, dict):
+            if stage_data.get("skipped"):
+                return "Skipped"
+            if stage_data.get("error"):
+                return "Failed"
+        return "Complete"
+
+    @_cached_render
+    def _render_pipeline_summary(self, summary: Dict, title: str) -> bytes:
+        """Draw the pipeline summary from the fields picked by ``pipeline_summary``."""
         self._apply_style()
 
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 
         # 1. Stage completion status (top-left)
         ax1 = axes[0, 0]
-        stages = results.get("stages", {})
-        stage_names = list(stages.keys())
-        stage_status = []
-        colors = []
-
-        for stage in stage_names:
-            stage_data = stages[stage]
-            if isinstance(stage_data, dict):
-                if stage_data.get("skipped"):
-                    stage_status.append("Skipped")
-                    colors.append(self.COLORS["neutral"])
-                elif stage_data.get("error"):
-                    stage_status.append("Failed")
-                    colors.append(self.COLORS["warning"])
-                else:
-                    stage_status.append("Complete")
-                    colors.append(self.COLORS["success"])
-            else:
-                stage_status.append("Complete")
-                colors.append(self.COLORS["success"])
+        stage_names = list(summary["stages"])
+        stage_status = list(summary["stages"].values())
+        status_colors = {
+            "Skipped": self.COLORS["neutral"],
+            "Failed": self.COLORS["warning"],
+            "Complete": self.COLORS["success"],
+        }
+        colors = [status_colors[status] for status in stage_status]
 
         y_pos = np.arange(len(stage_names))
         ax1.barh(y_pos, [1] * len(stage_names), color=colors, alpha=0.8)
@@ -371,11 +490,12 @@ class ChartGenerator:
 
         # 2. QED distribution of generated ligands (top-right)
         ax2 = axes[0, 1]
-        ligands = stages.get("ligand_generation", {}).get("molecules", [])
+        ligands = summary["ligands"]
         if ligands:
-            scores = [mol.get("score", 0) for mol in ligands]
-            ax2.hist(scores, bins=10, color=self.COLORS["primary"], edgecolor="white", alpha=0.8)
-            ax2.axvline(np.mean(scores), color=self.COLORS["accent"], linestyle="--", label=f"Mean: {np.mean(scores):.3f}")
+            scores = _extract(ligands, "score", 0.0)
+            mean_score = scores.mean()
+            self._histogram(ax2, scores, 10, alpha=0.8)
+            ax2.axvline(mean_score, color=self.COLORS["accent"], linestyle="--", label=f"Mean: {mean_score:.3f}")
             ax2.set_xlabel("QED Score")
             ax2.set_ylabel("Count")
             ax2.set_title("Generated Ligands QED Distribution", fontsize=12, fontweight="bold")
@@ -387,17 +507,16 @@ class ChartGenerator:
         # 3. Target information (bottom-left)
         ax3 = axes[1, 0]
         ax3.axis("off")
-        target_analysis = stages.get("target_analysis", {})
-        uniprot = target_analysis.get("uniprot", {})
+        uniprot = summary["uniprot"]
 
         info_text = f"""
-Target ID: {results.get('target_id', 'N/A')}
+Target ID: {summary['target_id']}
 Gene: {uniprot.get('gene', 'N/A')}
 Protein: {uniprot.get('protein_name', 'N/A')[:50]}
 Organism: {uniprot.get('organism', 'N/A')}
 Sequence Length: {uniprot.get('sequence_length', 'N/A')} residues
 
-Structure: {'✓ Predicted' if stages.get('structure_prediction', {}).get('pdb_generated') else '✗ Not available'}
+Structure: {'✓ Predicted' if summary['pdb_generated'] else '✗ Not available'}
 Ligands: {len(ligands)} generated
         """
         ax3.text(0.1, 0.9, info_text, fontsize=11, va="top", family="monospace",
@@ -409,7 +528,7 @@ Ligands: {len(ligands)} generated
         ax4.axis("off")
 
         if ligands:
-            sorted_ligands = sorted(ligands, key=lambda x: x.get("score", 0), reverse=True)[:5]
+            sorted_ligands = heapq.nlargest(5, ligands, key=lambda x: x.get("score", 0))
             table_data = []
             for i, mol in enumerate(sorted_ligands, 1):
                 smiles = mol.get("sample", "N/A")[:30]
@@ -439,6 +558,7 @@ Ligands: {len(ligands)} generated
 
         return self._fig_to_bytes(fig)
 
+    @_cached_render
     def lipinski_compliance(
         self,
         molecules: List[Dict],
@@ -469,30 +589,26 @@ Ligands: {len(ligands)} generated
 
         for idx, (rule_name, (prop, threshold, op)) in enumerate(thresholds.items()):
             ax = axes[idx]
-            values = [mol.get(prop, 0) for mol in molecules if mol.get(prop) is not None]
+            values = _extract(molecules, prop)
 
-            if not values:
+            if not values.size:
                 ax.text(0.5, 0.5, "No data", ha="center", va="center")
                 ax.set_title(rule_name)
                 continue
 
             # Calculate pass/fail
             if op == "le":
-                passed = sum(1 for v in values if v <= threshold)
+                passed = int(np.count_nonzero(values <= threshold))
             else:
-                passed = sum(1 for v in values if v >= threshold)
-
-            failed = len(values) - passed
+                passed = int(np.count_nonzero(values >= threshold))
 
             # Create histogram
-            colors_list = [self.COLORS["success"] if (v <= threshold if op == "le" else v >= threshold) else self.COLORS["warning"] for v in values]
-
-            ax.hist(values, bins=15, color=self.COLORS["primary"], edgecolor="white", alpha=0.7)
+            self._histogram(ax, values, 15, alpha=0.7)
             ax.axvline(threshold, color=self.COLORS["warning"], linestyle="--", linewidth=2, label=f"Threshold: {threshold}")
 
             ax.set_xlabel(prop.replace("_", " ").title())
             ax.set_ylabel("Count")
-            ax.set_title(f"{rule_name}\n({passed}/{len(values)} pass)", fontsize=11, fontweight="bold")
+            ax.set_title(f"{rule_name}\n({passed}/{values.size} pass)", fontsize=11, fontweight="bold")
             ax.legend()
 
         fig.suptitle(title, fontsize=14, fontweight="bold", y=1.02)
@@ -528,14 +644,18 @@ def create_pipeline_charts(
     results: Dict,
     output_dir: Union[str, Path],
     target_id: str,
+    draft: bool = False,
 ) -> Dict[str, str]:
     """
     Generate all charts for pipeline results.
 
+    Charts render inline, so repeat inputs are served from the render cache.
+
     Args:
         results: Pipeline results dictionary.
         output_dir: Output directory for charts.
         target_id: Target identifier for filenames.
+        draft: Render at half resolution (see ``ChartGenerator``).
 
     Returns:
         Dictionary mapping chart names to file paths.
@@ -543,27 +663,21 @@ def create_pipeline_charts(
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    generator = ChartGenerator()
+    generator = ChartGenerator(draft=draft)
     saved_charts = {}
 
-    # Pipeline summary
-    try:
-        summary_bytes = generator.pipeline_summary(results)
-        summary_path = output_dir / f"{target_id}_pipeline_summary.png"
-        generator.save_png(summary_bytes, summary_path)
-        saved_charts["pipeline_summary"] = str(summary_path)
-    except Exception as e:
-        print(f"Warning: Could not generate pipeline summary chart: {e}")
-
-    # QED distribution
+    # Chart name -> (description, ChartGenerator method args)
+    charts = {"pipeline_summary": ("pipeline summary", ("pipeline_summary", results))}
     ligands = results.get("stages", {}).get("ligand_generation", {}).get("molecules", [])
     if ligands:
+        charts["qed_distribution"] = ("QED distribution", ("qed_distribution", ligands))
+
+    for name, (_, (method, *args)) in charts.items():
         try:
-            qed_bytes = generator.qed_distribution(ligands)
-            qed_path = output_dir / f"{target_id}_qed_distribution.png"
-            generator.save_png(qed_bytes, qed_path)
-            saved_charts["qed_distribution"] = str(qed_path)
+            chart_path = output_dir / f"{target_id}_{name}.png"
+            generator.save_png(getattr(generator, method)(*args), chart_path)
+            saved_charts[name] = str(chart_path)
         except Exception as e:
-            print(f"Warning: Could not generate QED distribution chart: {e}")
+            print(f"Warning: Could not generate {charts[name][0]} chart: {e}")
 
     return saved_charts
@@ -12,7 +12,7 @@ Requires: rdkit>=2023.9.1, Pillow>=10.0.0
 
 import io
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from rdkit import Chem
 from rdkit.Chem import AllChem, Draw
@@ -40,20 +40,29 @@ class MoleculeVisualizer:
         """
         self.default_size = default_size
         self.default_font_size = default_font_size
+        # Parsed molecules by SMILES, so grids sharing molecules parse them once
+        self._mols: Dict[str, Optional[Chem.Mol]] = {}
 
     def smiles_to_mol(self, smiles: str) -> Optional[Chem.Mol]:
         """
         Convert SMILES string to RDKit Mol object.
 
+        Results are memoized per visualizer; callers must not modify the
+        returned molecule.
+
         Args:
             smiles: SMILES string representation of molecule.
 
         Returns:
             RDKit Mol object or None if parsing fails.
         """
+        if smiles in self._mols:
+            return self._mols[smiles]
+
         mol = Chem.MolFromSmiles(smiles)
         if mol is not None:
             AllChem.Compute2DCoords(mol)
+        self._mols[smiles] = mol
         return mol
 
     def smiles_to_image(